@@ -1,22 +1,18 @@
-
-
 from models.satellitemodel import SatelliteCreate,SatelliteUpdate
-from Backend.DB.Config import get_db_connection
-
-
-conn = get_db_connection()
+from Backend.DB.UnitOfWork import UnitOfWork
+from search_cache import search_cache
 
 
 def create_satellite_function(satellite: SatelliteCreate):
-    try:
-        cursor = conn.cursor()
-        
+    with UnitOfWork() as uow:
+        cursor = uow.cursor()
+
         # Insert into object table to get a new object_id for the satellite
         cursor.execute(
             "INSERT INTO object (object_type) VALUES ('SAT') RETURNING object_id"
         )
         object_id = cursor.fetchone()[0]
-        
+
         # Fetch the object_id of the parent planet based on its name
         cursor.execute(
             "SELECT object_id FROM planet WHERE planet_name = %s",
@@ -24,9 +20,11 @@ def create_satellite_function(satellite: SatelliteCreate):
         )
         result = cursor.fetchone()
         if result is None:
+            # Drop the object row inserted above
+            uow.rollback()
             return {"error": "Parent planet not found"}
         planet_id = result[0]
-        
+
         # Insert the satellite with the planet's object_id as parent_planet
         cursor.execute("""
             INSERT INTO satellite (object_id, satellite_name, parent_planet, satellite_radii,
@@ -36,14 +34,11 @@ def create_satellite_function(satellite: SatelliteCreate):
         """, (object_id, satellite.satellite_name, planet_id,
               satellite.satellite_radii, satellite.satellite_mass,
               satellite.orbital_period, satellite.atmosphere))
-        
+
         new_satellite = cursor.fetchone()
-        conn.commit()
+        uow.after_commit(lambda: search_cache.invalidate_names(satellite.satellite_name))
         return new_satellite
-    except Exception as e:
-        conn.rollback()
-        raise
-    
+
 
 def update_satellite_function(
     satellite_name,
@@ -54,9 +49,9 @@ def update_satellite_function(
     atmosphere = None,
 
 ):
-    try:
-        cursor = conn.cursor()
-        
+    with UnitOfWork() as uow:
+        cursor = uow.cursor()
+
         # Lists to build the dynamic SQL query
         set_clauses = []
         params = []
@@ -108,31 +103,23 @@ def update_satellite_function(
         if updated_satellite is None:
             return None  # Satellite not found
 
-        # Commit the transaction
-        conn.commit()
+        uow.after_commit(lambda: search_cache.invalidate_names(satellite_name))
         return updated_satellite
 
-    except Exception as e:
-        conn.rollback()
-        raise e
-    
-    
+
 def delete_satellite_function(satellite_name: str):
-    try:
-        cursor = conn.cursor()
+    with UnitOfWork() as uow:
+        cursor = uow.cursor()
         cursor.execute("SELECT object_id FROM satellite WHERE satellite_name = %s", (satellite_name,))
         result = cursor.fetchone()
         if result is None:
             return None  # Satellite not found
-        
+
         object_id = result[0]
-        
+
         cursor.execute("Delete from coordinates where object_id = %s",(object_id,))
         cursor.execute("DELETE FROM satellite WHERE satellite_name = %s", (satellite_name,))
         cursor.execute("DELETE FROM object WHERE object_id = %s", (object_id,))
-        
-        conn.commit()
+
+        uow.after_commit(lambda: search_cache.invalidate_names(satellite_name))
         return {"message": f"Satellite {satellite_name} deleted successfully"}
-    except Exception as e:
-        conn.rollback()
-        raise
\ No newline at end of file
@@ -1,56 +1,78 @@
 import psycopg2
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 
-from Backend.DB.Config import get_db_connection
+from fastapi.responses import JSONResponse
 
+from Backend.DB.AsyncDB import fetch_one
+from Backend.DB.Columnar import fetch_columns
+from streaming import columnar_response
+from render_cache import chart_response
+from rendering import figure_template, new_figure, figure_to_png
+from labels import DEFAULT_LABEL_MODE, DEFAULT_MAX_LABELS, significance_order, select_labels
 
-async def Coordinateshow(star_system: str):
-    image_path = '/home/shyan/Desktop/DbPostgresql/Backend/image/Coordinate_plot.png'
+STAR_SYSTEM_EXISTS_QUERY = "SELECT COUNT(*) FROM star_system WHERE system_name = %s"
 
+COORDINATES_QUERY = """
+    SELECT planet_name, ra_coord AS right_ascension, dec_coord AS declination, planetary_mass
+    FROM planet p
+    JOIN coordinates c ON p.object_id = c.object_id
+    WHERE p.origin_system = %s
+"""
+
+
+async def Coordinateshow(star_system: str, inline=False, if_none_match=None,
+                         label_mode=DEFAULT_LABEL_MODE, max_labels=DEFAULT_MAX_LABELS):
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM star_system WHERE system_name = %s", (star_system,))
-                if cur.fetchone()[0] == 0:
-                    return {"message": f"Star system '{star_system}' does not exist."}
-
-                
-                sql_query = """
-                    SELECT planet_name, ra_coord AS right_ascension, dec_coord AS declination
-                    FROM planet p
-                    JOIN coordinates c ON p.object_id = c.object_id
-                    WHERE p.origin_system = %s
-                """
-                cur.execute(sql_query, (star_system,))
-                result = cur.fetchall()
-
-                if not result:
-                    return {"message": "No data available for the given star system."}
-
-                planet_names = [row[0] for row in result]
-                ra_values = [row[1] for row in result]
-                dec_values = [row[2] for row in result]
-
-                
-                plt.figure(figsize=(10, 6))
-                plt.scatter(ra_values, dec_values, color='skyblue')
-                for i, planet in enumerate(planet_names):
-                    plt.text(ra_values[i], dec_values[i], planet, fontsize=9, ha='right')
-
-                plt.xlabel('Right Ascension (RA) in Degree')
-                plt.ylabel('Declination (DEC) in Degree')
-                plt.title(f'Planet Coordinates in the {star_system}')
-                plt.tight_layout()
-
-                plt.savefig(image_path)
-                plt.close()
-
-                return {
-                    "message": "Image created successfully",
-                    "image_path": "http://127.0.0.1:8000/view-image-Coordinate"
-                }
+        exists = await fetch_one(STAR_SYSTEM_EXISTS_QUERY, (star_system,))
+        if exists[0] == 0:
+            return {"message": f"Star system '{star_system}' does not exist."}
+
+        columns = await fetch_columns(COORDINATES_QUERY, (star_system,))
+
+        if not len(columns["planet_name"]):
+            return {"message": "No data available for the given star system."}
+
+        params = {"star_system": star_system, "label_mode": label_mode, "max_labels": max_labels}
+        return await chart_response("coordinates", params, columns,
+                                    _draw_coordinate_plot, (star_system, columns, label_mode, max_labels),
+                                    inline=inline, if_none_match=if_none_match)
 
     except Exception as e:
         return {"message": f"An error occurred during processing: {e}"}
+
+
+async def coordinates_data(star_system: str):
+    exists = await fetch_one(STAR_SYSTEM_EXISTS_QUERY, (star_system,))
+    if exists[0] == 0:
+        return JSONResponse(status_code=404, content={"message": f"Star system '{star_system}' does not exist."})
+
+    return columnar_response(await fetch_columns(COORDINATES_QUERY, (star_system,)))
+
+
+def _build_coordinate_figure():
+    fig = new_figure(figsize=(10, 6))
+    return fig, fig.add_subplot()
+
+
+def _draw_coordinate_plot(star_system, columns, label_mode=DEFAULT_LABEL_MODE, max_labels=DEFAULT_MAX_LABELS):
+    import numpy as np
+
+    planet_names = columns['planet_name']
+    ra_values = columns['right_ascension']
+    dec_values = columns['declination']
+    masses = columns['planetary_mass']
+
+
+    fig, ax = figure_template("coordinates", _build_coordinate_figure)
+    ax.scatter(ra_values, dec_values, color='skyblue')
+
+    # Label only the heaviest planets (or the heaviest per grid cell); the rest stay plain points
+    order = significance_order(np.zeros(len(planet_names)), masses)
+    for i in select_labels(np.column_stack([ra_values, dec_values]), order, label_mode, max_labels):
+        ax.text(ra_values[i], dec_values[i], planet_names[i], fontsize=9, ha='right')
+
+    ax.set_xlabel('Right Ascension (RA) in Degree')
+    ax.set_ylabel('Declination (DEC) in Degree')
+    ax.set_title(f'Planet Coordinates in the {star_system}')
+    fig.tight_layout()
+
+    return figure_to_png(fig)
@@ -1,62 +1,62 @@
 from pathlib import Path
 from fastapi.responses import JSONResponse
 import psycopg2
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from Backend.DB.Config import get_db_connection
-
-
-async def Telescope_image():
-    
-    IMAGE_DIR = Path("/home/shyan/Desktop/DbPostgresql/Backend/image/")
-    IMAGE_DIR.mkdir(parents=True, exist_ok=True)
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    
-    sql_query = """
-        SELECT d.discovery_year, t.telescope_id, COUNT(d.object_id) AS number_of_discoveries
-        FROM discovery d
-        JOIN telescope t ON d.telescope_id = t.telescope_id
-        GROUP BY d.discovery_year, t.telescope_id
-        ORDER BY d.discovery_year, t.telescope_id;
-    """
+from discovery_cube import CubeSelection, validate_cube_selection, discoveries_by_year_and_telescope
+from streaming import columnar_response
+from render_cache import chart_response
+from rendering import figure_template, new_figure, figure_to_png
+
+
+async def Telescope_image(inline=False, if_none_match=None, year_min=None, year_max=None):
+    selection = CubeSelection(year_min=year_min, year_max=year_max)
+    validate_cube_selection(selection)
     try:
-        cur.execute(sql_query)
-        result = cur.fetchall()
+        columns = await discoveries_by_year_and_telescope(selection)
     except Exception as e:
         return JSONResponse(
             status_code=500,
             content={"error": f"Database query failed: {e}"}
         )
-    finally:
-        cur.close()
-        conn.close()
-
-    
-    data = [
-        {'Discovery Year': i[0], 'Telescope Name': i[1], 'Number of Discoveries': i[2]}
-        for i in result
-    ]
-    df = pd.DataFrame(data)
-    df['Telescope-Year'] = df['Telescope Name'].astype(str) + '-' + df['Discovery Year'].astype(str)
-
-    
-    plt.figure(figsize=(12, 8))
-    sns.set_theme(style="whitegrid")
-    ax = sns.barplot(x='Telescope-Year', y='Number of Discoveries', data=df, palette='muted')
-    ax.set_xlabel('Telescope and Discovery Year')
-    ax.set_ylabel('Number of Discoveries')
-    ax.set_title('Telescope Discoveries Over Time')
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-    image_path = IMAGE_DIR / "Telescope_discovery_vs_year_seaborn.png"
-    plt.savefig(image_path)
-    plt.close()
 
-    return {
-        "message": "Image created successfully", 
-        "image_path": "http://127.0.0.1:8000/view-image"  
-    }
+    params = {"year_min": year_min, "year_max": year_max}
+    return await chart_response("telescope", params, columns, _draw_telescope_chart, (columns,),
+                                inline=inline, if_none_match=if_none_match)
+
+
+async def telescope_data(year_min=None, year_max=None):
+    selection = CubeSelection(year_min=year_min, year_max=year_max)
+    validate_cube_selection(selection)
+    try:
+        columns = await discoveries_by_year_and_telescope(selection)
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Database query failed: {e}"}
+        )
+    return columnar_response(columns)
+
+
+def _build_telescope_figure():
+    fig = new_figure(figsize=(12, 8))
+    return fig, fig.add_subplot()
 
+
+def _draw_telescope_chart(columns):
+    # One line per telescope over the discovery years; rows arrive ordered by year
+    years = columns['discovery_year']
+    telescopes = columns['telescope_id']
+    counts = columns['number_of_discoveries']
+
+    fig, ax = figure_template("telescope", _build_telescope_figure)
+    for telescope_id in dict.fromkeys(telescopes.tolist()):
+        mask = telescopes == telescope_id
+        ax.plot(years[mask], counts[mask], marker='o', label=telescope_id or 'Unknown')
+    ax.set_xlabel('Discovery Year')
+    ax.set_ylabel('Number of Discoveries')
+    ax.set_title('Telescope Discoveries Over Time')
+    # Gridlines set per axes: a global seaborn theme would leak into the other charts' templates
+    ax.grid(True)
+    if len(counts):
+        ax.legend(title='Telescope')
+    fig.tight_layout()
+    return figure_to_png(fig)
@@ -0,0 +1,130 @@
+import asyncio
+import json
+from bisect import bisect_left, insort
+
+import psycopg
+
+from Backend.DB.Config import get_conninfo
+from Backend.DB.AsyncDB import fetch_all
+from Backend.DB.SCHEMA.CatalogueNotify import CATALOGUE_NAMES_CHANNEL
+
+LISTENER_RETRY_SECONDS = 5.0
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 100
+
+
+# Sorted in-memory index of every catalogue name, so prefix lookups are a
+# binary search instead of a database round-trip. Only touched from the
+# event loop, so it needs no locking.
+class NameIndex:
+
+    def __init__(self):
+        self._keys = []       # (lower(name), object_id), sorted
+        self._entries = {}    # object_id -> (name, kind)
+        self.ready = asyncio.Event()
+
+    def load(self, rows):
+        self._entries = {object_id: (name, kind) for object_id, name, kind in rows}
+        self._keys = sorted((name.lower(), object_id) for object_id, (name, _) in self._entries.items())
+        self.ready.set()
+
+    def add(self, object_id, name, kind):
+        self.remove(object_id)
+        self._entries[object_id] = (name, kind)
+        insort(self._keys, (name.lower(), object_id))
+
+    def remove(self, object_id):
+        entry = self._entries.pop(object_id, None)
+        if entry is None:
+            return
+        key = (entry[0].lower(), object_id)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def apply(self, event):
+        if event["op"] == "add":
+            self.add(event["object_id"], event["name"], event["kind"])
+        elif event["op"] == "remove":
+            self.remove(event["object_id"])
+
+    def lookup(self, prefix, limit=DEFAULT_SUGGESTIONS, kinds=None):
+        prefix = prefix.strip().lower()
+        results = []
+        for i in range(bisect_left(self._keys, (prefix,)), len(self._keys)):
+            key, object_id = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            name, kind = self._entries[object_id]
+            if kinds and kind not in kinds:
+                continue
+            results.append({"name": name, "kind": kind})
+            if len(results) >= limit:
+                break
+        return results
+
+    def __len__(self):
+        return len(self._keys)
+
+
+name_index = NameIndex()
+_listener_task = None
+
+# Other in-process consumers of catalogue change events (e.g. the search
+# cache). They receive each add/remove/update event, and {"op": "reload"} whenever
+# the listener (re)connects and may have missed events.
+_change_subscribers = []
+
+
+def subscribe_to_changes(callback):
+    _change_subscribers.append(callback)
+
+
+def _publish(event):
+    for callback in _change_subscribers:
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"Catalogue change subscriber failed: {e}")
+
+
+async def _reload_index():
+    rows = await fetch_all("SELECT object_id, name, kind FROM catalogue_entry")
+    name_index.load(rows)
+
+
+async def _listen_for_changes():
+    # LISTEN is issued before the (re)load, so no change committed in between is missed.
+    while True:
+        try:
+            conn = await psycopg.AsyncConnection.connect(get_conninfo(), autocommit=True)
+            async with conn:
+                await conn.execute(f"LISTEN {CATALOGUE_NAMES_CHANNEL}")
+                await _reload_index()
+                _publish({"op": "reload"})
+                async for notify in conn.notifies():
+                    event = json.loads(notify.payload)
+                    name_index.apply(event)
+                    _publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Autocomplete listener lost its connection, retrying: {e}")
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+
+def start_autocomplete():
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_for_changes())
+
+
+async def stop_autocomplete():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
@@ -0,0 +1,101 @@
+# Measures per-render time of each chart with and without figure templates.
+# Run from Backend/Analysis with the repo root on PYTHONPATH (see pythonpath.sh):
+#   python bench_render.py [renders per chart]
+#
+# Results, two back-to-back runs of `python bench_render.py 30` (Agg backend,
+# 1 CPU, Python 3.11.7, matplotlib 3.11.2, seaborn 0.13.2, pandas 3.0.6,
+# numpy 2.4.6), ms per render:
+#
+#   chart               fresh   template  saving  |  fresh   template  saving
+#   telescope           310.8   319.6     -2.8%   |  399.9   341.7     14.6%
+#   stellar_dist        522.6   438.7     16.1%   |  627.7   593.2      5.5%
+#   planetary_systems   656.1   738.8    -12.6%   |  832.1   810.5      2.6%
+#   coordinates         344.4   384.9    -11.7%   |  459.3   423.2      7.9%
+#   map                 588.5   579.8      1.5%   |  623.7   570.2      8.6%
+#
+# The difference swings both ways between runs and stays within the noise of a
+# single shared CPU: creating the figure and axes is a small part of a render,
+# which is dominated by drawing, tight_layout and the PNG encode in savefig.
+# Templates are kept because they do not cost anything either, but the render
+# cache and ETags are what actually save time on repeated charts.
+import random
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+import rendering
+from Tels_disc_no_vs_year import _draw_telescope_chart
+from stellerDist import _draw_stellar_dist
+from planetsys import _draw_planetary_systems
+from Coordinate_plot import _draw_coordinate_plot
+from Map import _draw_3d_map
+from map_points import ra_dec_to_xyz
+from labels import significance_order
+
+
+def _as_columns(col_names, rows):
+    # Same shape as Backend.DB.Columnar.load_columns returns
+    return {name: np.array(values) for name, values in zip(col_names, zip(*rows))}
+
+
+def _sample_charts(rng):
+    telescope = _as_columns(["discovery_year", "telescope_id", "number_of_discoveries"],
+                            [(year, f"T-{telescope_id}", rng.randint(1, 40))
+                             for year in range(2000, 2020) for telescope_id in range(1, 6)])
+
+    stellar = _as_columns(["stellar_class", "star_count", "avg_mass", "avg_luminosity", "latest_discovery"],
+                          [(cls, rng.randint(1, 500), rng.uniform(0.1, 30), rng.uniform(0.01, 1000),
+                            rng.randint(1990, 2024)) for cls in "OBAFGKM"])
+
+    systems = _as_columns(["origin_system", "planet_count", "avg_planet_mass", "planets_with_atmosphere",
+                           "total_satellites", "system_age", "system_type", "asteroid_count"],
+                          [(f"System-{i}", rng.randint(1, 12), rng.uniform(0.1, 300), rng.randint(0, 5),
+                            rng.randint(0, 80), rng.uniform(0.5, 12), rng.choice(["single", "binary"]),
+                            rng.randint(0, 400)) for i in range(15)])
+
+    coordinates = _as_columns(["planet_name", "right_ascension", "declination", "planetary_mass"],
+                              [(f"Planet-{i}", rng.uniform(0, 360), rng.uniform(-90, 90), rng.uniform(0.01, 300))
+                               for i in range(300)])
+
+    n = 2000
+    kinds = np.array([rng.randint(0, 3) for _ in range(n)], dtype=np.uint8)
+    masses = np.array([rng.uniform(0.01, 300) for _ in range(n)])
+    xyz = ra_dec_to_xyz(np.array([rng.uniform(0, 360) for _ in range(n)]),
+                        np.array([rng.uniform(-90, 90) for _ in range(n)]))
+    names = [f"Object-{i}" for i in range(n)]
+
+    return {
+        "telescope": (_draw_telescope_chart, (telescope,)),
+        "stellar_dist": (_draw_stellar_dist, (stellar,)),
+        "planetary_systems": (_draw_planetary_systems, (systems,)),
+        "coordinates": (_draw_coordinate_plot, ("Bench", coordinates)),
+        "map": (_draw_3d_map, ("Bench", kinds, names, xyz, significance_order(kinds, masses))),
+    }
+
+
+def _time_renders(draw, args, renders):
+    draw(*args)    # first render builds the template and loads fonts
+    started = time.perf_counter()
+    for _ in range(renders):
+        draw(*args)
+    return (time.perf_counter() - started) / renders * 1000
+
+
+def main():
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    charts = _sample_charts(random.Random(42))
+
+    print(f"{'chart':<20}{'fresh ms':>12}{'template ms':>14}{'saving':>10}")
+    for name, (draw, args) in charts.items():
+        rendering.FIGURE_TEMPLATES = False
+        fresh = _time_renders(draw, args, renders)
+        rendering.FIGURE_TEMPLATES = True
+        reused = _time_renders(draw, args, renders)
+        print(f"{name:<20}{fresh:>12.1f}{reused:>14.1f}{(fresh - reused) / fresh:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Runs the ad-hoc plot bucketing query for every plottable column pair through
+# the ADBC loader (no fallback) and compares it with the row-wise pooled path.
+# Needs the database from Backend/DB/Config.py with ADBC and pyarrow installed.
+# Run from Backend/Analysis with the repo root on PYTHONPATH (see pythonpath.sh):
+#   python check_columnar.py
+import sys
+
+import numpy as np
+
+from Backend.DB import Columnar
+from Backend.DB.ConnectionPool import pooled_connection, close_pool
+from ichhamoto import PLOTTABLE_COLUMNS_QUERY, PLOTTABLE_TABLES, NUMERIC_TYPES, minmax_buckets_query
+from downsample import DEFAULT_POINT_BUDGET, LTTB_SOURCE_POINTS
+
+
+def _plottable_pairs():
+    with pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(PLOTTABLE_COLUMNS_QUERY, (list(PLOTTABLE_TABLES), list(NUMERIC_TYPES)))
+            rows = cur.fetchall()
+    tables = {}
+    for table, column in rows:
+        tables.setdefault(table, []).append(column)
+    for table, columns in tables.items():
+        yield table, columns[0], columns[-1]
+
+
+def _check(table, x_col, y_col, buckets):
+    query, params = minmax_buckets_query(table, x_col, y_col, buckets)
+    adbc = Columnar._adbc_columns(query, params)
+    pooled = Columnar._pooled_columns(query, params)
+
+    assert set(adbc) == {"x", "y", "total"}, f"unexpected columns {list(adbc)}"
+    assert adbc["x"].dtype == np.float64 and adbc["y"].dtype == np.float64
+    assert len(adbc["x"]) <= 2 * buckets, f"{len(adbc['x'])} points for {buckets} buckets"
+    assert np.all(np.diff(adbc["x"]) >= 0), "x is not sorted"
+    for name in ("x", "y", "total"):
+        assert np.array_equal(adbc[name], pooled[name]), f"ADBC and pooled {name} differ"
+    return len(adbc["x"]), int(adbc["total"][0]) if len(adbc["total"]) else 0
+
+
+def main():
+    failures = 0
+    for table, x_col, y_col in _plottable_pairs():
+        for buckets in (DEFAULT_POINT_BUDGET // 2, LTTB_SOURCE_POINTS // 2):
+            label = f"{table}.{x_col} vs {y_col}, {buckets} buckets"
+            try:
+                points, total = _check(table, x_col, y_col, buckets)
+                print(f"ok    {label}: {points} of {total} points")
+            except Exception as e:
+                failures += 1
+                print(f"FAIL  {label}: {e}")
+    Columnar.close_columnar_connections()
+    close_pool()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
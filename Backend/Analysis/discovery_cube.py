@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException
+
+from Backend.DB.Columnar import fetch_columns
+
+# Reads of the trigger-maintained discovery_cube table (see
+# Backend/DB/SCHEMA/DiscoveryCube.py): discoveries per year, telescope and
+# object type. '' in the cube stands for a missing telescope or object type.
+# Every query returns {column: ndarray} from the columnar loader.
+
+
+@dataclass
+class CubeSelection:
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    telescope_id: Optional[str] = None
+    object_type: Optional[str] = None
+
+
+def validate_cube_selection(selection: CubeSelection):
+    if (selection.year_min is not None and selection.year_max is not None
+            and selection.year_min > selection.year_max):
+        raise HTTPException(status_code=400, detail="year_min must not be greater than year_max")
+
+
+def _cube_filter(selection: CubeSelection):
+    conditions = []
+    params = {}
+    if selection.year_min is not None:
+        conditions.append("discovery_year >= %(year_min)s")
+        params["year_min"] = selection.year_min
+    if selection.year_max is not None:
+        conditions.append("discovery_year <= %(year_max)s")
+        params["year_max"] = selection.year_max
+    if selection.telescope_id is not None:
+        conditions.append("telescope_id = %(telescope_id)s")
+        params["telescope_id"] = selection.telescope_id
+    if selection.object_type is not None:
+        conditions.append("object_type = %(object_type)s")
+        params["object_type"] = selection.object_type.strip()
+    return ("WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+
+async def discoveries_by_year_and_telescope(selection: CubeSelection = CubeSelection()):
+    where, params = _cube_filter(selection)
+    return await fetch_columns(f"""
+        SELECT discovery_year, NULLIF(telescope_id, '') AS telescope_id,
+               sum(discoveries)::int AS number_of_discoveries
+        FROM discovery_cube
+        {where}
+        GROUP BY discovery_year, telescope_id
+        ORDER BY discovery_year, telescope_id
+    """, params)
+
+
+async def cumulative_discoveries(selection: CubeSelection = CubeSelection()):
+    # Discoveries per year with the running total up to and including that year
+    where, params = _cube_filter(selection)
+    return await fetch_columns(f"""
+        SELECT discovery_year, discoveries,
+               sum(discoveries) OVER (ORDER BY discovery_year)::int AS cumulative_discoveries
+        FROM (
+            SELECT discovery_year, sum(discoveries)::int AS discoveries
+            FROM discovery_cube
+            {where}
+            GROUP BY discovery_year
+        ) yearly
+        ORDER BY discovery_year
+    """, params)
+
+
+async def telescope_series(telescope_id: str, selection: CubeSelection = CubeSelection()):
+    # One telescope's discoveries per year and object type, with its running
+    # total through each year
+    selection = CubeSelection(selection.year_min, selection.year_max, telescope_id, selection.object_type)
+    where, params = _cube_filter(selection)
+    return await fetch_columns(f"""
+        SELECT discovery_year, NULLIF(object_type, '') AS object_type, discoveries,
+               sum(discoveries) OVER (ORDER BY discovery_year)::int AS cumulative_discoveries
+        FROM discovery_cube
+        {where}
+        ORDER BY discovery_year, object_type
+    """, params)
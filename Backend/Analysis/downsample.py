@@ -0,0 +1,67 @@
+from fastapi import HTTPException
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+DEFAULT_DOWNSAMPLE_METHOD = "lttb"
+DEFAULT_POINT_BUDGET = 1000
+MAX_POINT_BUDGET = 10000
+# LTTB needs the series itself, so the database first reduces it to at most
+# this many points by min/max bucketing (see ichhamoto.py)
+LTTB_SOURCE_POINTS = 100000
+
+# Both functions take a series sorted by x and return the indices of the points
+# to keep, in order, so x and y (or any other column) can be taken together.
+
+
+def validate_downsample_options(method, points):
+    if method not in DOWNSAMPLE_METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of {', '.join(DOWNSAMPLE_METHODS)}")
+    if not 3 <= points <= MAX_POINT_BUDGET:
+        raise HTTPException(status_code=400, detail=f"points must be between 3 and {MAX_POINT_BUDGET}")
+
+
+def lttb(x, y, points):
+    # Largest-Triangle-Three-Buckets: keeps the first and last points and, from
+    # each bucket in between, the point forming the largest triangle with the
+    # point kept from the previous bucket and the mean of the next bucket
+    import numpy as np
+
+    n = len(x)
+    if points >= n:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, points - 1).astype(np.intp)
+    selected = np.empty(points, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_buckets(x, y, points):
+    # Splits the series into about points / 2 equal-count buckets and keeps the
+    # lowest and highest y of each, so spikes survive at any zoom level
+    import numpy as np
+
+    n = len(x)
+    if points >= n:
+        return np.arange(n)
+
+    buckets = max((points - 2) // 2, 1)    # plus the first and last points
+    bucket = np.arange(n) * buckets // n
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate([[0, n - 1], order[starts], order[ends]]))
+
+
+def downsample(x, y, points=DEFAULT_POINT_BUDGET, method=DEFAULT_DOWNSAMPLE_METHOD):
+    keep = lttb(x, y, points) if method == "lttb" else minmax_buckets(x, y, points)
+    return x[keep], y[keep]
@@ -1,85 +1,138 @@
-import psycopg2
-import matplotlib.pyplot as plt
-import numpy as np
-import os
-from Backend.DB.Config import get_db_connection
-
-
-def ichhamoton():
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    
-    sql_query = """
-    SELECT tablename
-    FROM pg_tables
-    WHERE schemaname NOT IN ('pg_catalog', 'information_schema');
-    """
-    cur.execute(sql_query)
-    result = cur.fetchall()  
-    tables = [row[0] for row in result]
-    
-    print("Available Tables:")
-    for i, table in enumerate(tables):
-        print(f"{i + 1}. {table}")
-    
-    
-    table_index = int(input("Select a table (number): ")) - 1
-    if table_index < 0 or table_index >= len(tables):
-        print("Invalid selection!")
-        return
-    selected_table = tables[table_index]
-    
-    
-    sql_query_for_selected_column = """
-    SELECT column_name
-    FROM information_schema.columns
-    WHERE table_name = %s;
-    """
-    cur.execute(sql_query_for_selected_column, (selected_table,))
-    column_names = [row[0] for row in cur.fetchall()]
-    
-    print("Available Columns:")
-    for i, col in enumerate(column_names):
-        print(f"{i + 1}. {col}")
-    
-    
-    x_index = int(input("Select X-axis column (number): ")) - 1
-    y_index = int(input("Select Y-axis column (number): ")) - 1
-    if x_index < 0 or x_index >= len(column_names) or y_index < 0 or y_index >= len(column_names):
-        print("Invalid column selection!")
-        return
-    
-    x_col = column_names[x_index]
-    y_col = column_names[y_index]
-    
-    
-    sql_query_x = f"SELECT {x_col} FROM {selected_table};"
-    cur.execute(sql_query_x)
-    X = np.array([row[0] for row in cur.fetchall()])
-    
-    sql_query_y = f"SELECT {y_col} FROM {selected_table};"
-    cur.execute(sql_query_y)
-    Y = np.array([row[0] for row in cur.fetchall()])
-    
-    
-    plt.figure(figsize=(10, 6))
-    plt.plot(X, Y)
-    plt.title(f"{selected_table}: {x_col} vs {y_col}")
-    plt.xlabel(x_col)
-    plt.ylabel(y_col)
-    plt.grid(True)
-    
-    
-    image_path = "/home/shyan/Desktop/DbPostgresql/Backend/image/ichhamoton.png"
-    os.makedirs(os.path.dirname(image_path), exist_ok=True)
-    try:
-        plt.savefig(image_path)
-        print(f"Image saved to {image_path}")
-    except Exception as e:
-        print(f"Error saving image: {e}")
-    plt.close()
-
-
-if __name__ == "__main__":
-    ichhamoton()
+from fastapi import HTTPException
+from psycopg import sql
+
+from Backend.DB.AsyncDB import fetch_all
+from Backend.DB.Columnar import fetch_columns
+from render_cache import chart_response
+from rendering import figure_template, new_figure, figure_to_png
+from downsample import DEFAULT_DOWNSAMPLE_METHOD, DEFAULT_POINT_BUDGET, LTTB_SOURCE_POINTS, downsample
+
+# Ad-hoc "column vs column" plots of the catalogue tables. Table and column
+# names come from the client, so they are checked against information_schema
+# and only ever reach SQL as quoted identifiers.
+NUMERIC_TYPES = ("smallint", "integer", "bigint", "numeric", "real", "double precision")
+
+# Catalogue data only; rollups, the discovery cube and other derived tables are not offered
+PLOTTABLE_TABLES = ("star_system", "star", "planet", "satellite", "miscellaneous",
+                    "coordinates", "telescope", "discovery")
+
+PLOTTABLE_COLUMNS_QUERY = """
+    SELECT c.table_name, c.column_name
+    FROM information_schema.columns c
+    JOIN information_schema.tables t
+      ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+    WHERE c.table_schema = 'public' AND t.table_type = 'BASE TABLE'
+    AND c.table_name = ANY(%s) AND c.data_type = ANY(%s)
+    ORDER BY c.table_name, c.ordinal_position
+"""
+
+
+async def plottable_columns():
+    # {table: [numeric columns]} for the plottable catalogue tables
+    tables = {}
+    params = (list(PLOTTABLE_TABLES), list(NUMERIC_TYPES))
+    for table_name, column_name in await fetch_all(PLOTTABLE_COLUMNS_QUERY, params):
+        tables.setdefault(table_name, []).append(column_name)
+    return tables
+
+
+async def _validate_columns(table, x_col, y_col):
+    columns = (await plottable_columns()).get(table)
+    if columns is None:
+        raise HTTPException(status_code=404, detail=f"Table '{table}' not found or has no numeric columns")
+    for column in (x_col, y_col):
+        if column not in columns:
+            raise HTTPException(status_code=400, detail=f"'{column}' is not a numeric column of '{table}'")
+
+
+# Min/max bucketing done by the database: the x range is split into equal-width
+# buckets and only the lowest and highest y of each (with their x) are returned.
+# min/max over ARRAY[y, x] picks a whole point in one hash aggregate, so the
+# table is neither sorted nor sent over in full. Non-finite values are skipped.
+# ADBC binds a Python int as int8, and width_bucket only takes an int4 count,
+# hence the casts.
+MINMAX_BUCKETS_QUERY = sql.SQL("""
+    WITH points AS MATERIALIZED (
+        SELECT {x}::float8 AS x, {y}::float8 AS y
+        FROM {table}
+        WHERE {x}::float8 > '-Infinity' AND {x}::float8 < 'Infinity'
+        AND {y}::float8 > '-Infinity' AND {y}::float8 < 'Infinity'
+    ),
+    bounds AS (
+        SELECT min(x) AS lo, max(x) AS hi, count(*) AS total FROM points
+    ),
+    extremes AS (
+        SELECT min(ARRAY[p.y, p.x]) AS low, max(ARRAY[p.y, p.x]) AS high
+        FROM points p CROSS JOIN bounds b
+        GROUP BY CASE WHEN b.hi > b.lo
+                      THEN least(width_bucket(p.x, b.lo, b.hi, %(buckets)s::int), %(buckets)s::int)
+                      ELSE 1 END
+    )
+    SELECT DISTINCT e.point[2] AS x, e.point[1] AS y, b.total
+    FROM extremes
+    CROSS JOIN LATERAL (VALUES (low), (high)) AS e(point)
+    CROSS JOIN bounds b
+    ORDER BY 1, 2
+""")
+
+
+def minmax_buckets_query(table, x_col, y_col, buckets):
+    # (query, params) for MINMAX_BUCKETS_QUERY; the names must already be validated
+    query = MINMAX_BUCKETS_QUERY.format(
+        x=sql.Identifier(x_col), y=sql.Identifier(y_col), table=sql.Identifier(table))
+    return query.as_string(None), {"buckets": max(buckets, 1)}
+
+
+async def column_series(table, x_col, y_col, points=DEFAULT_POINT_BUDGET, method=DEFAULT_DOWNSAMPLE_METHOD):
+    # Both columns in one query, bucketed by the database and sorted by x, then
+    # reduced to at most `points` points. For "minmax" the database result is
+    # already within the budget; "lttb" runs on up to LTTB_SOURCE_POINTS points.
+    await _validate_columns(table, x_col, y_col)
+    budget = points if method == "minmax" else LTTB_SOURCE_POINTS
+    columns = await fetch_columns(*minmax_buckets_query(table, x_col, y_col, budget // 2))
+
+    x, y = columns["x"], columns["y"]
+    total = int(columns["total"][0]) if len(columns["total"]) else 0
+    x, y = downsample(x, y, points, method)
+    return x, y, total
+
+
+async def series_data(table, x_col, y_col, points=DEFAULT_POINT_BUDGET, method=DEFAULT_DOWNSAMPLE_METHOD):
+    x, y, total = await column_series(table, x_col, y_col, points, method)
+    return {
+        "table": table,
+        "x": x_col,
+        "y": y_col,
+        "total_points": total,
+        "method": method,
+        "length": len(x),
+        "columns": {"x": x.tolist(), "y": y.tolist()},
+    }
+
+
+async def ichhamoton(table, x_col, y_col, points=DEFAULT_POINT_BUDGET, method=DEFAULT_DOWNSAMPLE_METHOD,
+                     inline=False, if_none_match=None):
+    x, y, total = await column_series(table, x_col, y_col, points, method)
+    params = {"table": table, "x": x_col, "y": y_col, "points": points, "method": method}
+    return await chart_response("ichhamoton", params, [x, y], _draw_column_plot,
+                                (table, x_col, y_col, x, y, total),
+                                inline=inline, if_none_match=if_none_match)
+
+
+def _build_column_plot_figure():
+    fig = new_figure(figsize=(10, 6))
+    return fig, fig.add_subplot()
+
+
+def _draw_column_plot(table, x_col, y_col, x, y, total):
+    fig, ax = figure_template("ichhamoton", _build_column_plot_figure)
+    ax.plot(x, y)
+    title = f"{table}: {x_col} vs {y_col}"
+    if len(x) < total:
+        title += f" ({len(x)} of {total} points)"
+    ax.set_title(title)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+    ax.grid(True)
+    fig.tight_layout()
+    return figure_to_png(fig)
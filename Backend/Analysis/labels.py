@@ -0,0 +1,47 @@
+from fastapi import HTTPException
+
+LABEL_MODES = ("top", "grid")
+DEFAULT_LABEL_MODE = "top"
+DEFAULT_MAX_LABELS = 40
+MAX_LABELS = 200
+LABEL_GRID_CELLS = 10    # per axis, for the "grid" mode
+
+# Text layout is the expensive part of a dense chart, so only a bounded number
+# of objects get a label; the rest are drawn as plain points. NumPy is imported
+# inside the functions so loading this module stays cheap for the API process.
+
+
+def validate_label_options(label_mode, max_labels):
+    if label_mode not in LABEL_MODES:
+        raise HTTPException(status_code=400, detail=f"label_mode must be one of: {', '.join(LABEL_MODES)}")
+    if not 0 <= max_labels <= MAX_LABELS:
+        raise HTTPException(status_code=400, detail=f"max_labels must be between 0 and {MAX_LABELS}")
+
+
+def significance_order(rank, magnitude):
+    # Indices sorted most significant first: lowest rank (e.g. stars before
+    # planets), then largest magnitude (mass, brightness); unknown magnitudes last.
+    import numpy as np
+
+    magnitude = np.asarray(magnitude, dtype=np.float64)
+    magnitude = np.where(np.isnan(magnitude), -np.inf, magnitude)
+    return np.lexsort((-magnitude, np.asarray(rank)))
+
+
+def select_labels(screen_xy, order, label_mode=DEFAULT_LABEL_MODE, max_labels=DEFAULT_MAX_LABELS):
+    # "top" labels the first max_labels objects of order; "grid" keeps only the
+    # most significant object in each cell of a grid over the plotted area,
+    # so labels are spread out and cannot pile up on each other.
+    import numpy as np
+
+    order = np.asarray(order)
+    if label_mode == "grid" and len(order):
+        screen_xy = np.asarray(screen_xy, dtype=np.float64)
+        low = screen_xy.min(axis=0)
+        span = np.ptp(screen_xy, axis=0)
+        span[span == 0] = 1.0
+        cells = np.minimum(((screen_xy - low) / span * LABEL_GRID_CELLS).astype(int), LABEL_GRID_CELLS - 1)
+        cell_ids = cells[:, 0] * LABEL_GRID_CELLS + cells[:, 1]
+        _, first_in_cell = np.unique(cell_ids[order], return_index=True)
+        order = order[np.sort(first_in_cell)]
+    return order[:max_labels]
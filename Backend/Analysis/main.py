@@ -1,3 +1,6 @@
+import time
+_import_started = time.perf_counter()
+
 from http.client import HTTPException
 from typing import Optional
 from urllib.request import Request
@@ -6,18 +9,29 @@ from models.starmodel import StarCreate, StarUpdate
 from fastapi import FastAPI, Query
 from fastapi.responses import FileResponse, JSONResponse
 from models.satellitemodel import SatelliteCreate, SatelliteUpdate
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 from pathlib import Path
-from stellerDist import analyze_stellar_dist
-from planetsys import analyze_planetary_systems
-from Backend.DB.Config import get_db_connection
+from stellerDist import analyze_stellar_dist, stellar_dist_data
+from planetsys import analyze_planetary_systems, planetary_systems_data, system_overview
+from Backend.DB.ConnectionPool import pool_stats, close_pool
+from Backend.DB.Columnar import close_columnar_connections
+from Backend.DB.AsyncDB import fetch_all, fetch_with_columns, stream_rows, run_blocking, async_pool_stats, close_async_pool
+from streaming import ndjson_response, wants_ndjson, columnar_response
+from autocomplete import name_index, start_autocomplete, stop_autocomplete, subscribe_to_changes, DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS
+from search_cache import search_cache
+from rendering import shutdown_render_pool
+from warmup import start_warmup, stop_warmup, is_ready, record_timing, startup_timings
+from render_cache import find_artifact, single_flight, ARTIFACT_CACHE_CONTROL
 from fastapi.middleware.cors import CORSMiddleware
-from Tels_disc_no_vs_year import Telescope_image
-from Coordinate_plot import Coordinateshow
-from search_system import general_search, specified_search
+from Tels_disc_no_vs_year import Telescope_image, telescope_data
+from ichhamoto import ichhamoton, plottable_columns, series_data
+from downsample import DEFAULT_DOWNSAMPLE_METHOD, DEFAULT_POINT_BUDGET, validate_downsample_options
+from discovery_cube import (CubeSelection, validate_cube_selection, discoveries_by_year_and_telescope,
+                            cumulative_discoveries, telescope_series)
+from Coordinate_plot import Coordinateshow, coordinates_data
+from search_system import general_search, specified_search, batch_search
 from Map import Create3DMap
+from labels import DEFAULT_LABEL_MODE, DEFAULT_MAX_LABELS, validate_label_options
+from map_points import MapSelection, validate_selection, fetch_map_points, point_buffer_response, point_names_response
 from CRUD.CRUD_star import create_star, update_star, delete_star,get_star
 from pydantic import BaseModel
 from models.planetmodel import PlanetCreate,PlanetUpdate
@@ -25,6 +39,7 @@ from CRUD.CRUD_Planet import create_planet_function,update_planet,delete_planet_
 from CRUD.CRUD_satellite import create_satellite_function,update_satellite_function,delete_satellite_function
 from fastapi import Request
 app = FastAPI()
+record_timing("import_seconds", _import_started)
 
 origins = [
     "http://127.0.0.1:5500",  
@@ -41,8 +56,26 @@ app.add_middleware(
     expose_headers=["*"]  # Optional: Expose headers if needed
 )
 
-IMAGE_DIR = Path("/home/shyan/Desktop/DbPostgresql/Backend/image/")
-IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+@app.on_event("startup")
+async def startup_autocomplete():
+    subscribe_to_changes(search_cache.apply_catalogue_event)
+    start_autocomplete()
+
+@app.on_event("startup")
+async def startup_warmup():
+    # Pools and render workers come up in the background; see /ready
+    start_warmup()
+    record_timing("startup_seconds", _import_started)
+    print(f"API started in {startup_timings['startup_seconds']}s")
+
+@app.on_event("shutdown")
+async def shutdown_db_pools():
+    await stop_warmup()
+    await stop_autocomplete()
+    shutdown_render_pool()
+    await close_async_pool()
+    close_columnar_connections()
+    close_pool()
 
 @app.post("/api/generalSearch")
 async def api_general_search(request: Request):
@@ -52,72 +85,182 @@ async def api_general_search(request: Request):
 async def api_specified_search(request: Request):
     return await specified_search(request)
 
-
-@app.post("/upload-image/")
-async def upload_image():
-    return await Telescope_image()
-
-@app.get("/view-image")
-async def view_image():
-    file_path = IMAGE_DIR / "Telescope_discovery_vs_year_seaborn.png"
-    if file_path.exists():
-        return FileResponse(file_path)
-    return JSONResponse(status_code=404, content={"error": "Image not found"})
-
-@app.post("/upload-image-Coordinate_plot")
-async def upload_Cordinate_image(star_system: str = Query(...)):
-    return await Coordinateshow(star_system)
-
-@app.get('/view-image-Coordinate')
-async def show_Coordinate_image():
-    file_path = IMAGE_DIR / "Coordinate_plot.png"
-    if file_path.exists():
-        return FileResponse(file_path)
-    return JSONResponse(status_code=404, content={"error": "Image not found"})
-
-@app.post("/upload-image-Planetsys")
-async def upload_PlanetSys_image():
-    return await analyze_planetary_systems()
-
-@app.get("/show-image-Planetsys")
-async def show_PlanetSys_image():
-    file_path = IMAGE_DIR / "plntsys.png"
-    if file_path.exists():
-        return FileResponse(file_path)
-    return JSONResponse(status_code=404, content={"error": "Image not found"})
-
-@app.post("/upload-image-stellerDist")
-async def upload_Steller_image():
-    return await analyze_stellar_dist()
-
-@app.get("/show-image-stellerDist")
-async def show_Steller_image():
-    file_path = IMAGE_DIR / "StellerDist.png"
-    if file_path.exists():
-        return FileResponse(file_path)
-    return JSONResponse(status_code=404, content={"error": "Image not found"})
+@app.post("/api/batchSearch")
+async def api_batch_search(request: Request):
+    return await batch_search(request)
+
+@app.get("/api/search-cache/stats")
+async def get_search_cache_stats():
+    return search_cache.stats()
+
+@app.get("/api/autocomplete")
+async def api_autocomplete(prefix: str = Query(..., min_length=1),
+                           limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+                           kind: Optional[str] = None):
+    if not name_index.ready.is_set():
+        return JSONResponse(status_code=503, content={"error": "Autocomplete index is still loading"})
+    kinds = {kind} if kind else None
+    return {"suggestions": name_index.lookup(prefix, limit, kinds)}
+
+
+# Chart endpoints. GET is the form to use with inline=true: browsers only send
+# If-None-Match on GET, so that is what makes the ETag/304 revalidation work.
+# POST is kept for existing clients.
+@app.api_route("/upload-image/", methods=["GET", "POST"])
+async def upload_image(request: Request, inline: bool = False,
+                       year_min: Optional[int] = None, year_max: Optional[int] = None):
+    etag = request.headers.get("if-none-match")
+    return await single_flight(("telescope", inline, etag, year_min, year_max),
+                               Telescope_image, inline, etag, year_min, year_max)
+
+@app.api_route("/upload-image-Coordinate_plot", methods=["GET", "POST"])
+async def upload_Cordinate_image(request: Request, star_system: str = Query(...), inline: bool = False,
+                                 label_mode: str = DEFAULT_LABEL_MODE, max_labels: int = DEFAULT_MAX_LABELS):
+    validate_label_options(label_mode, max_labels)
+    etag = request.headers.get("if-none-match")
+    return await single_flight(("coordinates", star_system, inline, etag, label_mode, max_labels),
+                               Coordinateshow, star_system, inline, etag, label_mode, max_labels)
+
+@app.api_route("/upload-image-Planetsys", methods=["GET", "POST"])
+async def upload_PlanetSys_image(request: Request, inline: bool = False):
+    etag = request.headers.get("if-none-match")
+    return await single_flight(("planetary_systems", inline, etag), analyze_planetary_systems, inline, etag)
+
+@app.api_route("/upload-image-stellerDist", methods=["GET", "POST"])
+async def upload_Steller_image(request: Request, inline: bool = False):
+    etag = request.headers.get("if-none-match")
+    return await single_flight(("stellar_dist", inline, etag), analyze_stellar_dist, inline, etag)
 
 @app.get("/star-systems/")
-async def get_star_systems():
+async def get_star_systems(format: Optional[str] = None):
+    if wants_ndjson(format):
+        return ndjson_response(
+            stream_rows("SELECT system_name, distance, system_type, system_age FROM star_system ORDER BY system_name"),
+            lambda row: {"system_name": row[0], "distance": row[1], "system_type": row[2], "system_age": row[3]},
+        )
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT DISTINCT system_name FROM star_system")
-                result = cur.fetchall()
+        result = await fetch_all("SELECT DISTINCT system_name FROM star_system")
         star_systems = [row[0] for row in result]
         return {"star_systems": star_systems}
     except Exception as e:
         return {"error": f"Failed to fetch star systems: {e}"}
 
-@app.post("/MAP/")
-async def postmap(ss: str):
-    return await Create3DMap(ss)
-
-@app.get("/viewmap")
-async def getmap():
-    file_path = IMAGE_DIR / "Mapping.png"
-    if file_path.exists():
-        return FileResponse(file_path)
+@app.get("/star-systems/{system_name}/overview")
+async def get_star_system_overview(system_name: str):
+    overview = await system_overview(system_name)
+    if overview is None:
+        raise HTTPException(status_code=404, detail="Star system not found")
+    return overview
+
+@app.get("/ready")
+async def get_readiness():
+    # 503 until warmup has opened the database pools and started the render workers
+    status_code = 200 if is_ready() else 503
+    return JSONResponse(status_code=status_code, content={"ready": is_ready(), "timings": startup_timings})
+
+@app.get("/db-pool/stats")
+async def get_db_pool_stats():
+    return {"sync": pool_stats(), "async": async_pool_stats()}
+
+@app.api_route("/MAP/", methods=["GET", "POST"])
+async def postmap(request: Request, ss: str, inline: bool = False,
+                  label_mode: str = DEFAULT_LABEL_MODE, max_labels: int = DEFAULT_MAX_LABELS):
+    validate_label_options(label_mode, max_labels)
+    etag = request.headers.get("if-none-match")
+    return await single_flight(("map", ss, inline, etag, label_mode, max_labels),
+                               Create3DMap, ss, inline, etag, label_mode, max_labels)
+
+# Data behind each chart as columnar JSON, for clients that draw it themselves
+@app.get("/chart-data/telescope")
+async def get_telescope_chart_data(year_min: Optional[int] = None, year_max: Optional[int] = None):
+    return await telescope_data(year_min, year_max)
+
+@app.get("/chart-data/coordinates")
+async def get_coordinates_chart_data(star_system: str = Query(...)):
+    return await coordinates_data(star_system)
+
+@app.get("/chart-data/stellar-dist")
+async def get_stellar_dist_chart_data():
+    return await stellar_dist_data()
+
+@app.get("/chart-data/planetary-systems")
+async def get_planetary_systems_chart_data():
+    return await planetary_systems_data()
+
+# Discovery counts from the pre-aggregated discovery cube, filtered by year
+# range, telescope and object type
+def _cube_selection(year_min, year_max, telescope_id=None, object_type=None):
+    selection = CubeSelection(year_min, year_max, telescope_id, object_type)
+    validate_cube_selection(selection)
+    return selection
+
+@app.get("/discoveries/by-telescope")
+async def get_discoveries_by_telescope(year_min: Optional[int] = None, year_max: Optional[int] = None,
+                                       telescope_id: Optional[str] = None, object_type: Optional[str] = None):
+    return columnar_response(await discoveries_by_year_and_telescope(
+        _cube_selection(year_min, year_max, telescope_id, object_type)))
+
+@app.get("/discoveries/cumulative")
+async def get_cumulative_discoveries(year_min: Optional[int] = None, year_max: Optional[int] = None,
+                                     telescope_id: Optional[str] = None, object_type: Optional[str] = None):
+    return columnar_response(await cumulative_discoveries(
+        _cube_selection(year_min, year_max, telescope_id, object_type)))
+
+@app.get("/discoveries/telescopes/{telescope_id}/series")
+async def get_telescope_series(telescope_id: str, year_min: Optional[int] = None, year_max: Optional[int] = None,
+                               object_type: Optional[str] = None):
+    return columnar_response(await telescope_series(
+        telescope_id, _cube_selection(year_min, year_max, object_type=object_type)))
+
+# Ad-hoc "column vs column" plots of any catalogue table, downsampled to a
+# point budget; /analytics/tables lists what can be plotted
+@app.get("/analytics/tables")
+async def get_analytics_tables():
+    return await plottable_columns()
+
+@app.get("/analytics/series")
+async def get_analytics_series(table: str, x: str, y: str, points: int = DEFAULT_POINT_BUDGET,
+                               method: str = DEFAULT_DOWNSAMPLE_METHOD):
+    validate_downsample_options(method, points)
+    return await series_data(table, x, y, points, method)
+
+@app.api_route("/analytics/plot", methods=["GET", "POST"])
+async def post_analytics_plot(request: Request, table: str, x: str, y: str, points: int = DEFAULT_POINT_BUDGET,
+                              method: str = DEFAULT_DOWNSAMPLE_METHOD, inline: bool = False):
+    validate_downsample_options(method, points)
+    etag = request.headers.get("if-none-match")
+    return await single_flight(("ichhamoton", table, x, y, points, method, inline, etag),
+                               ichhamoton, table, x, y, points, method, inline, etag)
+
+# Packed positions for client-side 3D viewers: select a star system and/or an
+# RA/Dec region (ra_min > ra_max wraps through 0). /map/names returns the
+# matching name table in the same order.
+def _map_selection(star_system, ra_min, ra_max, dec_min, dec_max):
+    selection = MapSelection(star_system, ra_min, ra_max, dec_min, dec_max)
+    validate_selection(selection)
+    return selection
+
+@app.get("/map/points")
+async def get_map_points(star_system: Optional[str] = None, ra_min: Optional[float] = None,
+                         ra_max: Optional[float] = None, dec_min: Optional[float] = None,
+                         dec_max: Optional[float] = None, use_distance: bool = False):
+    points = await fetch_map_points(_map_selection(star_system, ra_min, ra_max, dec_min, dec_max))
+    return point_buffer_response(points, use_distance)
+
+@app.get("/map/names")
+async def get_map_names(star_system: Optional[str] = None, ra_min: Optional[float] = None,
+                        ra_max: Optional[float] = None, dec_min: Optional[float] = None,
+                        dec_max: Optional[float] = None):
+    points = await fetch_map_points(_map_selection(star_system, ra_min, ra_max, dec_min, dec_max))
+    return point_names_response(points)
+
+# Charts rendered by the POST endpoints above, addressed by the image_id they
+# return. With inline=true those endpoints answer with the PNG directly instead.
+@app.get("/images/{image_id}")
+async def view_chart_image(image_id: str):
+    file_path = find_artifact(image_id)
+    if file_path is not None:
+        return FileResponse(file_path, media_type="image/png", headers={"Cache-Control": ARTIFACT_CACHE_CONTROL})
     return JSONResponse(status_code=404, content={"error": "Image not found"})
 
 
@@ -126,19 +269,17 @@ async def getmap():
 # cursor = get_db_connection().cursor()
 @app.get("/stars/{star_name}")
 async def get_star(star_name: str):
-    cursor = get_db_connection().cursor()
-    cursor.execute("SELECT * FROM star WHERE star_name = %s", (star_name,))
-    star = cursor.fetchone()
-    if star:
-        columns = [desc[0] for desc in cursor.description]
-        return dict(zip(columns, star))
+    columns, rows = await fetch_with_columns("SELECT * FROM star WHERE star_name = %s", (star_name,))
+    if rows:
+        return dict(zip(columns, rows[0]))
     raise HTTPException(status_code=404, detail="Star not found")
     
 
 @app.post("/create-star/")
 async def create_star_endpoint(star: StarCreate):
     try:
-        new_star = create_star(
+        new_star = await run_blocking(
+            create_star,
             star.star_name,
             star.origin_system,
             star.luminosity,
@@ -154,7 +295,8 @@ async def create_star_endpoint(star: StarCreate):
 @app.put("/update-star/{star_name}")
 async def update_star_endpoint(star_name: str, star: StarUpdate):
     try:
-        updated_star = update_star(
+        updated_star = await run_blocking(
+            update_star,
             star_name=star_name,  # Use path parameter here
             new_star_name=star.new_star_name,
             origin_system=star.origin_system,
@@ -172,7 +314,7 @@ async def update_star_endpoint(star_name: str, star: StarUpdate):
 @app.delete("/delete-star/{star_name}")
 async def delete_star_endpoint(star_name: str):
     try:
-        result = delete_star(star_name)
+        result = await run_blocking(delete_star, star_name)
         if "error" in result:
             return {"error": result["error"]}
         return {"message": result["message"]}
@@ -182,12 +324,9 @@ async def delete_star_endpoint(star_name: str):
 
 @app.get("/planets/{planet_name}")
 async def getplanet(planet_name:str):
-    cursor = get_db_connection().cursor()
-    cursor.execute("SELECT * FROM planet WHERE lower(trim(planet_name)) = %s", (planet_name,))
-    planet = cursor.fetchone()
-    if planet:
-        columns = [desc[0] for desc in cursor.description]
-        return dict(zip(columns, planet))
+    columns, rows = await fetch_with_columns("SELECT * FROM planet WHERE lower(trim(planet_name)) = %s", (planet_name,))
+    if rows:
+        return dict(zip(columns, rows[0]))
     raise HTTPException(status_code=404, detail="Planet not found")
     
 
@@ -261,14 +400,11 @@ def delete_satellite(satellite_name: str):
 @app.get("/parent-planet")
 async def get_parent_planet():
     
-    cursor = get_db_connection().cursor()
-    cursor.execute("""
+    planets = await fetch_all("""
             SELECT DISTINCT planet.planet_name 
             FROM planet 
             JOIN satellite ON planet.object_id = satellite.parent_planet
         """)
-
-    planets = cursor.fetchall()  # Fetch all rows
         
     if planets:
         return {"planet_names": [row[0] for row in planets]}  # Return as a list
@@ -279,12 +415,9 @@ async def get_parent_planet():
 @app.get("/satellites/{satellite_name}")
 
 async def getSatellite(satellite_name:str):
-    cursor = get_db_connection().cursor()
-    cursor.execute("SELECT * FROM satellite WHERE lower(trim(satellite_name)) = %s", (satellite_name,))
-    satellite = cursor.fetchone()
-    if satellite:
-        columns = [desc[0] for desc in cursor.description]
-        return dict(zip(columns, satellite))
+    columns, rows = await fetch_with_columns("SELECT * FROM satellite WHERE lower(trim(satellite_name)) = %s", (satellite_name,))
+    if rows:
+        return dict(zip(columns, rows[0]))
     raise HTTPException(status_code=404, detail="satellite not found")
 
         
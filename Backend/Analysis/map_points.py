@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from Backend.DB.Columnar import fetch_columns
+
+# Type codes sent alongside the positions; the names endpoint returns the legend
+KIND_CODES = {"star": 0, "planet": 1, "satellite": 2, "misc": 3}
+KIND_NAMES = {code: kind for kind, code in KIND_CODES.items()}
+
+# Objects without a catalogued distance are placed on the unit sphere
+DEFAULT_DISTANCE = 1.0
+
+# Every object kind in one round-trip, tagged with its type code. Satellites
+# belong to the system of their parent planet.
+_MAP_POINTS_QUERY = """
+    SELECT 0 AS kind, s.object_id, s.star_name AS name,
+           c.ra_coord::float8, c.dec_coord::float8, c.distance::float8, s.solar_mass::float8 AS mass
+    FROM star s
+    JOIN coordinates c ON c.object_id = s.object_id
+    WHERE {star}
+    UNION ALL
+    SELECT 1, p.object_id, p.planet_name,
+           c.ra_coord::float8, c.dec_coord::float8, c.distance::float8, p.planetary_mass::float8
+    FROM planet p
+    JOIN coordinates c ON c.object_id = p.object_id
+    WHERE {planet}
+    UNION ALL
+    SELECT 2, sat.object_id, sat.satellite_name,
+           c.ra_coord::float8, c.dec_coord::float8, c.distance::float8, sat.satellite_mass::float8
+    FROM satellite sat
+    JOIN planet p ON p.object_id = sat.parent_planet
+    JOIN coordinates c ON c.object_id = sat.object_id
+    WHERE {satellite}
+    UNION ALL
+    SELECT 3, m.object_id, m.misc_name,
+           c.ra_coord::float8, c.dec_coord::float8, c.distance::float8, NULL::float8
+    FROM miscellaneous m
+    JOIN coordinates c ON c.object_id = m.object_id
+    WHERE {misc}
+    ORDER BY 1, 2
+"""
+
+
+@dataclass
+class MapSelection:
+    star_system: Optional[str] = None
+    ra_min: Optional[float] = None
+    ra_max: Optional[float] = None
+    dec_min: Optional[float] = None
+    dec_max: Optional[float] = None
+
+
+@dataclass
+class MapPoints:
+    # NumPy arrays, except names
+    kinds: object       # uint8 type codes
+    names: list
+    ra: object          # degrees
+    dec: object         # degrees
+    distance: object    # NaN where unknown
+    mass: object        # in the unit of each kind's table; NaN where unknown
+
+    def __len__(self):
+        return len(self.names)
+
+
+def validate_selection(selection: MapSelection):
+    region = (selection.ra_min, selection.ra_max, selection.dec_min, selection.dec_max)
+    has_region = any(bound is not None for bound in region)
+    if has_region and any(bound is None for bound in region):
+        raise HTTPException(status_code=400, detail="A sky region needs ra_min, ra_max, dec_min and dec_max")
+    if not has_region and not selection.star_system:
+        raise HTTPException(status_code=400, detail="Either star_system or a sky region is required")
+    if has_region:
+        if not (-90 <= selection.dec_min <= selection.dec_max <= 90):
+            raise HTTPException(status_code=400, detail="Declination bounds must satisfy -90 <= dec_min <= dec_max <= 90")
+        if not (0 <= selection.ra_min <= 360 and 0 <= selection.ra_max <= 360):
+            raise HTTPException(status_code=400, detail="Right ascension bounds must be between 0 and 360")
+
+
+def _map_points_query(selection: MapSelection):
+    conditions = {"star": [], "planet": [], "satellite": [], "misc": []}
+    params = {}
+    if selection.star_system:
+        conditions["star"].append("s.origin_system = %(system)s")
+        conditions["planet"].append("p.origin_system = %(system)s")
+        conditions["satellite"].append("p.origin_system = %(system)s")
+        conditions["misc"].append("m.origin_system = %(system)s")
+        params["system"] = selection.star_system
+    if selection.ra_min is not None:
+        # A region with ra_min > ra_max wraps through RA 0
+        ra_join = "AND" if selection.ra_min <= selection.ra_max else "OR"
+        region = (f"(c.ra_coord >= %(ra_min)s {ra_join} c.ra_coord <= %(ra_max)s)"
+                  " AND c.dec_coord BETWEEN %(dec_min)s AND %(dec_max)s")
+        for kind_conditions in conditions.values():
+            kind_conditions.append(region)
+        params.update(ra_min=selection.ra_min, ra_max=selection.ra_max,
+                      dec_min=selection.dec_min, dec_max=selection.dec_max)
+    clauses = {kind: " AND ".join(kind_conditions) for kind, kind_conditions in conditions.items()}
+    return _MAP_POINTS_QUERY.format(**clauses), params
+
+
+async def fetch_map_points(selection: MapSelection) -> MapPoints:
+    import numpy as np
+
+    query, params = _map_points_query(selection)
+    columns = await fetch_columns(query, params)
+    return MapPoints(
+        kinds=columns["kind"].astype(np.uint8),
+        names=columns["name"].tolist(),
+        ra=columns["ra_coord"].astype(np.float64, copy=False),
+        dec=columns["dec_coord"].astype(np.float64, copy=False),
+        distance=columns["distance"].astype(np.float64, copy=False),    # NULL -> NaN
+        mass=columns["mass"].astype(np.float64, copy=False),
+    )
+
+
+def ra_dec_to_xyz(ra, dec, distance=None):
+    # Whole-array spherical -> Cartesian conversion; returns an (n, 3) array
+    import numpy as np
+
+    ra_rad = np.radians(ra)
+    dec_rad = np.radians(dec)
+    cos_dec = np.cos(dec_rad)
+    xyz = np.empty((len(ra_rad), 3), dtype=np.float64)
+    xyz[:, 0] = cos_dec * np.cos(ra_rad)
+    xyz[:, 1] = cos_dec * np.sin(ra_rad)
+    xyz[:, 2] = np.sin(dec_rad)
+    if distance is not None:
+        xyz *= np.where(np.isnan(distance), DEFAULT_DISTANCE, distance)[:, None]
+    return xyz
+
+
+def point_buffer_response(points: MapPoints, use_distance=False):
+    # Body: n * (x, y, z) little-endian float32, then n uint8 type codes.
+    # The name table for the same selection comes from point_names_response.
+    xyz = ra_dec_to_xyz(points.ra, points.dec, points.distance if use_distance else None)
+    body = xyz.astype("<f4").tobytes() + points.kinds.tobytes()
+    headers = {"X-Point-Count": str(len(points)), "Access-Control-Expose-Headers": "X-Point-Count"}
+    return Response(content=body, media_type="application/octet-stream", headers=headers)
+
+
+def point_names_response(points: MapPoints):
+    return {
+        "count": len(points),
+        "kinds": KIND_NAMES,
+        "names": points.names,
+        "types": points.kinds.tolist(),
+    }
@@ -1,72 +1,82 @@
-import os
 import psycopg2
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from Backend.DB.Config import get_db_connection
+from Backend.DB.AsyncDB import fetch_with_columns
+from Backend.DB.Columnar import fetch_columns
+from streaming import columnar_response
+from render_cache import chart_response
+from rendering import figure_template, new_figure, figure_to_png
+
+# Reads the trigger-maintained system_composition table (see
+# Backend/DB/SCHEMA/SystemComposition.py) instead of aggregating planets,
+# satellites, asteroids and stars on every request
+PLANETARY_SYSTEMS_QUERY = """
+SELECT c.system_name AS origin_system,
+       c.planet_count,
+       c.planet_mass_sum / NULLIF(c.planet_mass_count, 0) AS avg_planet_mass,
+       c.planets_with_atmosphere,
+       c.satellite_count AS total_satellites,
+       sys.system_age,
+       sys.system_type,
+       c.asteroid_count
+FROM system_composition c
+JOIN star_system sys ON sys.system_name = c.system_name
+WHERE c.planet_count > 0 AND c.fgk_star_count > 0
+ORDER BY c.planet_count DESC;
+"""
+
+SYSTEM_OVERVIEW_QUERY = """
+SELECT sys.system_name,
+       sys.system_type,
+       sys.system_age,
+       sys.distance,
+       COALESCE(c.planet_count, 0) AS planet_count,
+       COALESCE(c.planets_with_atmosphere, 0) AS planets_with_atmosphere,
+       c.planet_mass_sum / NULLIF(c.planet_mass_count, 0) AS avg_planet_mass,
+       COALESCE(c.satellite_count, 0) AS satellite_count,
+       c.satellite_mass_sum / NULLIF(c.satellite_mass_count, 0) AS avg_satellite_mass,
+       COALESCE(c.asteroid_count, 0) AS asteroid_count,
+       COALESCE(c.comet_count, 0) AS comet_count,
+       COALESCE(c.black_hole_count, 0) AS black_hole_count,
+       COALESCE(c.fgk_star_count, 0) > 0 AS has_fgk_star
+FROM star_system sys
+LEFT JOIN system_composition c ON c.system_name = sys.system_name
+WHERE sys.system_name = %s;
+"""
+
+
+async def analyze_planetary_systems(inline=False, if_none_match=None):
+    columns = await fetch_columns(PLANETARY_SYSTEMS_QUERY)
+    return await chart_response("planetary_systems", {}, columns, _draw_planetary_systems, (columns,),
+                                inline=inline, if_none_match=if_none_match)
+
+
+async def planetary_systems_data():
+    return columnar_response(await fetch_columns(PLANETARY_SYSTEMS_QUERY))
+
+
+async def system_overview(system_name):
+    col_names, results = await fetch_with_columns(SYSTEM_OVERVIEW_QUERY, (system_name,))
+    if not results:
+        return None
+    return dict(zip(col_names, results[0]))
+
+
+def _build_planetary_systems_figure():
+    fig = new_figure(figsize=(12, 10))
+    return fig, fig.subplots(2, 1)
+
+
+def _draw_planetary_systems(columns):
+    import seaborn as sns
+    import pandas as pd
+
+    df = pd.DataFrame(columns, copy=False)
 
-async def analyze_planetary_systems():
-    
-    
-    image_path = '/home/shyan/Desktop/DbPostgresql/Backend/image/plntsys'
-    if not os.path.exists(os.path.dirname(image_path)):
-        os.makedirs(os.path.dirname(image_path))      
-    
-    conn = get_db_connection()
-    
-    
-    sql_query = """
-    with planet_counts AS (
-        select
-        p.origin_system,
-        COUNT(*) as planet_count,
-        AVG(p.planetary_mass) as avg_planet_mass,
-        SUM(CASE when p.atmosphere = 'y' then 1 else 0 end) as planets_with_atmosphere
-        
-        FROM planet p
-        GROUP BY p.origin_system
-    ),
-    satellite_stats AS (
-        select p.origin_system,
-               count(DISTINCT sat.object_id) as total_satellites,
-               AVG(sat.satellite_mass) as avg_satellite_mass
-        FROM planet p
-        left join satellite sat on p.object_id = sat.parent_planet
-        group by p.origin_system
-    )
-    SELECT pc.*,
-           ss.total_satellites,
-           sys.system_age,
-           sys.system_type,
-           (SELECT COUNT(*)
-            FROM miscellaneous m 
-            WHERE m.origin_system = pc.origin_system 
-            AND m.misc_category = 'asteroid') as asteroid_count
-    from planet_counts pc
-    join satellite_stats ss ON pc.origin_system = ss.origin_system
-    join star_system sys ON pc.origin_system = sys.system_name
-    where exists (
-        SELECT 1 
-        FROM star s 
-        WHERE s.origin_system = pc.origin_system
-        AND s.stellar_class IN ('F', 'G', 'K')
-    )
-    ORDER BY pc.planet_count DESC;
-    """
-    
-    
-    df = pd.read_sql_query(sql_query, conn)
-    
-    
-    conn.close()
-    
-    
     df_melted = pd.melt(df, 
                         id_vars=['origin_system', 'system_type'],
                         value_vars=['planet_count', 'total_satellites', 'asteroid_count'])
     
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    fig, (ax1, ax2) = figure_template("planetary_systems", _build_planetary_systems_figure)
     
     
     sns.barplot(data=df_melted,
@@ -77,7 +87,7 @@ async def analyze_planetary_systems():
     ax1.set_title('System Composition by Object Type')
     ax1.set_xlabel('Star System')
     ax1.set_ylabel('Count')
-    plt.xticks(rotation=45)
+    ax1.tick_params(axis='x', labelrotation=45)
     
     
     sns.scatterplot(data=df,
@@ -91,22 +101,6 @@ async def analyze_planetary_systems():
     ax2.set_ylabel('Number of Planets')
     
     
-    plt.tight_layout()
-    
-    try:
-        # Save the plot
-        plt.savefig(image_path)
-        print(f"Image saved to {image_path}")
-    except Exception as e:
-        print(f"Error saving image: {e}")
-    
-    plt.close()
-
-
-    return {
-        "message": "Image created successfully", 
-        "image_path": "http://127.0.0.1:8000/show-image-Planetsys"  
-    }
-    
-    
+    fig.tight_layout()
 
+    return figure_to_png(fig)
@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from fastapi.responses import Response
+
+from Backend.DB.AsyncDB import run_blocking
+from rendering import render_chart
+
+RENDER_CACHE_DIR = Path("/home/shyan/Desktop/DbPostgresql/Backend/image/cache/")
+RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Rendered charts are stored content-addressed: the file name is a hash of the
+# chart type, its parameters and the rows it was drawn from. A request whose
+# query returns the same data finds the PNG already on disk and skips the draw;
+# any catalogue change alters the data and therefore the key. The hash doubles
+# as the artifact ID handed back to clients.
+_ARTIFACT_ID = re.compile(r"[0-9a-f]{64}")
+_in_flight = {}    # key -> task shared by concurrent identical requests
+_pending_stores = set()
+
+# Artifact URLs never change content; inline responses are revalidated by ETag
+ARTIFACT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+INLINE_CACHE_CONTROL = "no-cache"
+
+
+def _key_default(value):
+    # NumPy arrays hash by their raw contents; str() would elide large arrays.
+    # Object arrays (text columns) hold pointers, so they hash by their values.
+    if hasattr(value, "dtype") and value.dtype.kind == "O":
+        return value.tolist()
+    if hasattr(value, "tobytes") and hasattr(value, "dtype"):
+        digest = hashlib.sha256(value.tobytes()).hexdigest()
+        return f"{value.dtype}{value.shape}:{digest}"
+    return str(value)
+
+
+def render_key(chart, params, data):
+    payload = json.dumps([chart, params, data], default=_key_default, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def artifact_path(key):
+    return RENDER_CACHE_DIR / f"{key}.png"
+
+
+def find_artifact(artifact_id):
+    if not _ARTIFACT_ID.fullmatch(artifact_id):
+        return None
+    path = artifact_path(artifact_id)
+    return path if path.exists() else None
+
+
+def artifact_url(artifact_id):
+    return f"http://127.0.0.1:8000/images/{artifact_id}"
+
+
+async def single_flight(key, func, *args):
+    # Concurrent calls with the same key await one run of func(*args). The
+    # shared task is shielded so a caller that disconnects does not cancel it
+    # for the others.
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(func(*args))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def _lookup(path):
+    try:
+        # Refresh the mtime so eviction treats the artifact as recently used
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _store(path, png):
+    RENDER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(png)
+    os.replace(tmp_path, path)
+    _evict()
+
+
+def _load(path):
+    try:
+        png = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    os.utime(path)
+    return png
+
+
+def _evict():
+    entries = []
+    total = 0
+    for entry in os.scandir(RENDER_CACHE_DIR):
+        if entry.name.endswith(".png"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= RENDER_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+async def _render_artifact(key, draw, args):
+    path = artifact_path(key)
+    if not await run_blocking(_lookup, path):
+        png = await render_chart(draw, *args)
+        await run_blocking(_store, path, png)
+    return key
+
+
+async def cached_render(chart, params, data, draw, *args):
+    # Returns the artifact ID. draw(*args) must return PNG bytes; it only runs
+    # when no artifact exists for the key, and at most once at a time per key.
+    key = render_key(chart, params, data)
+    return await single_flight(key, _render_artifact, key, draw, args)
+
+
+async def _render_png(key, draw, args):
+    path = artifact_path(key)
+    png = await run_blocking(_load, path)
+    if png is None:
+        png = await render_chart(draw, *args)
+        # Populate the cache without holding up the response
+        store = asyncio.ensure_future(run_blocking(_store, path, png))
+        _pending_stores.add(store)
+        store.add_done_callback(_pending_stores.discard)
+    return png
+
+
+def _etag_matches(etag, if_none_match):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+async def chart_response(chart, params, data, draw, args, inline=False, if_none_match=None):
+    # Default: render (or reuse) the artifact and return its ID for GET /images/{id}.
+    # inline: answer with the PNG bytes themselves, or 304 when the client's
+    # copy was drawn from the same data (clients revalidate over GET).
+    if not inline:
+        image_id = await cached_render(chart, params, data, draw, *args)
+        return {
+            "message": "Image created successfully",
+            "image_id": image_id,
+            "image_path": artifact_url(image_id)
+        }
+
+    key = render_key(chart, params, data)
+    headers = {"ETag": f'"{key}"', "Cache-Control": INLINE_CACHE_CONTROL}
+    if _etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=304, headers=headers)
+    png = await single_flight(("png", key), _render_png, key, draw, args)
+    return Response(content=png, media_type="image/png", headers=headers)
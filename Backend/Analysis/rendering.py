@@ -0,0 +1,98 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+RENDER_WORKERS = max(1, min(4, (multiprocessing.cpu_count() or 2) - 1))
+RENDER_QUEUE_LIMIT = RENDER_WORKERS * 2    # jobs submitted to the pool at once
+
+# Charts are drawn in a pool of warm worker processes: each has the Agg
+# backend selected and matplotlib/seaborn imported before its first job, and
+# pyplot's global state is private to the process. Renders therefore use
+# several cores and never block the API's event loop.
+_render_pool = None
+_render_slots = None
+
+
+def _init_render_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn  # noqa: F401
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
+
+    # Draw and discard one figure so font caches are loaded before the first job
+    fig = plt.figure()
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def _warm_up():
+    return True
+
+
+def _get_render_pool():
+    global _render_pool, _render_slots
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_render_worker,
+        )
+        _render_slots = asyncio.Semaphore(RENDER_QUEUE_LIMIT)
+    return _render_pool
+
+
+# Per-worker figure templates: each chart builds its Figure and axes (and any
+# theme setup) once, and later renders in the same worker clear the axes and
+# draw into them again. Turned off by bench_render.py to measure the saving.
+FIGURE_TEMPLATES = True
+_figure_templates = {}
+
+
+def figure_template(name, build):
+    # build() returns (fig, axes); a reused template comes back with its axes cleared
+    if not FIGURE_TEMPLATES:
+        return build()
+    template = _figure_templates.get(name)
+    if template is None:
+        template = _figure_templates[name] = build()
+    else:
+        for ax in template[0].axes:
+            ax.cla()
+    return template
+
+
+def new_figure(**kwargs):
+    # Figures outside pyplot's registry: nothing global to close, and a template
+    # stays alive only through _figure_templates
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
+
+
+def figure_to_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+async def render_chart(draw, *args):
+    # Runs draw(*args) in a render worker and returns its result. draw must be
+    # a module-level function and its arguments picklable.
+    pool = _get_render_pool()
+    async with _render_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, draw, *args)
+
+
+async def warm_render_pool():
+    pool = _get_render_pool()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(pool, _warm_up) for _ in range(RENDER_WORKERS)))
+
+
+def shutdown_render_pool():
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+
+SEARCH_CACHE_MAX_ENTRIES = 2048
+SEARCH_CACHE_TTL = 300.0    # seconds; bounds staleness for changes made by other workers
+
+
+# Bounded LRU + TTL cache of search result pages, keyed by
+# (endpoint, filter, mode, keyword, page_size, cursor, include_total).
+# CRUD writes invalidate exactly the entries whose keyword could match a
+# changed name. It is shared by the event loop and the threads running sync
+# CRUD handlers, hence the lock. Every invalidation bumps a generation counter;
+# a miss records the generation before reading the database and set() drops
+# the page if an invalidation landed in between, so a read that raced a
+# commit is never cached.
+class SearchCache:
+
+    def __init__(self, max_entries=SEARCH_CACHE_MAX_ENTRIES, ttl=SEARCH_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()    # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._stale_drops = 0
+        self._generation = 0
+
+    @staticmethod
+    def make_key(endpoint, filter_word, mode, keyword, page):
+        return (endpoint, filter_word, mode, keyword.strip().lower(), page.size,
+                tuple(page.after) if page.after else None, page.include_total)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self._stale_drops += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_names(self, *names):
+        # A changed name can only appear in results for keywords it matches:
+        # prefixes of it (prefix mode) or substrings of it (infix mode).
+        # Fuzzy matches cannot be predicted, so those entries always go.
+        names = [name.strip().lower() for name in names if name]
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                mode, keyword = key[2], key[3]
+                if mode == "prefix":
+                    affected = any(name.startswith(keyword) for name in names)
+                elif mode == "infix":
+                    affected = any(keyword in name for name in names)
+                else:
+                    affected = True
+                if affected:
+                    del self._entries[key]
+                    self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def apply_catalogue_event(self, event):
+        # Change notifications from other workers (see autocomplete.py); renames
+        # arrive as remove + add, attribute-only changes as a single update
+        if event["op"] == "reload":
+            self.clear()
+        else:
+            self.invalidate_names(event["name"])
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "stale_drops": self._stale_drops,
+            }
+
+
+search_cache = SearchCache()
@@ -0,0 +1,134 @@
+import base64
+import json
+from dataclasses import dataclass
+
+from fastapi import HTTPException
+
+# Match modes understood by the search endpoints. All of them compare against
+# lower(<name>), which is what the indexes in Backend/DB/SCHEMA/SearchIndexes.py and
+# Backend/DB/SCHEMA/Catalogue.py cover:
+#   prefix - anchored "keyword%" match (btree text_pattern_ops index)
+#   infix  - "%keyword%" anywhere in the name (trigram GIN index)
+#   fuzzy  - infix, or typo-tolerant trigram word similarity (trigram GIN index)
+SEARCH_MODES = ("prefix", "infix", "fuzzy")
+DEFAULT_SEARCH_MODE = "prefix"
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def validate_mode(mode):
+    mode = (mode or DEFAULT_SEARCH_MODE).lower()
+    if mode not in SEARCH_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid search mode '{mode}', expected one of {', '.join(SEARCH_MODES)}",
+        )
+    return mode
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_params(keyword: str) -> dict:
+    # Named parameters so one keyword can be referenced from every UNION branch.
+    kw = keyword.strip().lower()
+    escaped = escape_like(kw)
+    return {"kw": kw, "prefix": escaped + "%", "infix": "%" + escaped + "%"}
+
+
+def name_match(column: str, mode: str):
+    # Returns (predicate, score) SQL fragments for a name column. Exact matches
+    # rank above prefix matches, and trigram word similarity breaks ties. The
+    # score is float8 so the value in a cursor compares equal to the stored row;
+    # a real would come back rounded from its printed form.
+    col = f"lower({column})"
+    if mode == "prefix":
+        predicate = f"{col} LIKE %(prefix)s"
+    elif mode == "infix":
+        predicate = f"{col} LIKE %(infix)s"
+    else:
+        predicate = f"({col} LIKE %(infix)s OR %(kw)s <%% {col})"
+
+    score = (
+        f"(CASE WHEN {col} = %(kw)s THEN 2 WHEN {col} LIKE %(prefix)s THEN 1 ELSE 0 END"
+        f" + word_similarity(%(kw)s, {col})::float8)"
+    )
+    return predicate, score
+
+
+@dataclass
+class PageRequest:
+    size: int
+    after: list | None        # sort key of the last row of the previous page
+    include_total: bool
+
+
+def parse_page(data: dict, mode: str) -> PageRequest:
+    try:
+        page_size = data.get("page_size")
+        size = DEFAULT_PAGE_SIZE if page_size is None else int(page_size)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="page_size must be an integer")
+    if size < 1 or size > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+
+    after = None
+    if data.get("cursor"):
+        after = decode_cursor(data["cursor"], mode)
+    return PageRequest(size=size, after=after, include_total=bool(data.get("include_total")))
+
+
+def encode_cursor(mode: str, key: list) -> str:
+    payload = json.dumps({"m": mode, "k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str, mode: str) -> list:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = payload["k"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if payload.get("m") != mode:
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different search mode")
+    return key
+
+
+def keyset_clauses(column: str, mode: str, after):
+    # Returns (sort_columns, after_predicate, order_by) for paging by keyset.
+    # Prefix results are ordered by name so a page is a range scan of the name
+    # index; ranked modes order by score first. object_id breaks name ties.
+    col = f"lower({column})"
+    if mode == "prefix":
+        sort_columns = f"{col} AS sort_name, object_id AS sort_id"
+        order_by = f"{col}, object_id"
+        after_predicate = f"AND ({col}, object_id) > (%(after_name)s, %(after_id)s)" if after else ""
+    else:
+        _, score = name_match(column, mode)
+        sort_columns = f"{score} AS sort_score, {col} AS sort_name, object_id AS sort_id"
+        order_by = f"{score} DESC, {col}, object_id"
+        after_predicate = (
+            f"AND ({score} < %(after_score)s"
+            f" OR ({score} = %(after_score)s AND ({col}, object_id) > (%(after_name)s, %(after_id)s)))"
+        ) if after else ""
+    return sort_columns, after_predicate, order_by
+
+
+def keyset_params(mode: str, after) -> dict:
+    if not after:
+        return {}
+    try:
+        if mode == "prefix":
+            name, object_id = after
+            return {"after_name": str(name), "after_id": int(object_id)}
+        score, name, object_id = after
+        return {"after_score": float(score), "after_name": str(name), "after_id": int(object_id)}
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def sort_key_width(mode: str) -> int:
+    return 2 if mode == "prefix" else 3
@@ -1,7 +1,13 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 import psycopg2
-from Backend.DB.Config import get_db_connection  # Ensure this returns a psycopg2 connection
+from Backend.DB.AsyncDB import async_connection, stream_rows
+from search_engine import (
+    validate_mode, search_params, name_match, parse_page, PageRequest,
+    keyset_clauses, keyset_params, sort_key_width, encode_cursor, DEFAULT_PAGE_SIZE,
+)
+from streaming import ndjson_response, wants_ndjson
+from search_cache import search_cache
 
 app = FastAPI()
 
@@ -27,49 +33,45 @@ async def general_search(request: Request):
     keyword = data.get("keyword", "")
     if not keyword:
         raise HTTPException(status_code=400, detail="Keyword is required")
+    mode = validate_mode(data.get("mode"))
+
+    if wants_ndjson(data.get("format")):
+        # Bulk consumers get every match, streamed, instead of one page
+        query, params = _search_query(GENERAL_COLUMNS, GENERAL_KINDS, keyword, mode)
+        return ndjson_response(stream_rows(query, params), _general_record)
+
+    page = parse_page(data, mode)
+    cache_key = search_cache.make_key("general", None, mode, keyword, page)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = search_cache.generation()
     
-    connection = get_db_connection()
     try:
-        cursor = connection.cursor()
-        # Using %s placeholders for psycopg2. Note that for UNION queries you must supply a parameter for each use.
-        query = """
-            SELECT star.star_name, star.origin_system, UPPER(object.object_type), discovery.telescope_id, discovery.discovery_year 
-            FROM star
-            JOIN object ON star.object_id = object.object_id
-            LEFT JOIN discovery ON star.object_id = discovery.object_id 
-            WHERE star.star_name LIKE %s
-            UNION
-            SELECT planet.planet_name, planet.origin_system, UPPER(object.object_type), discovery.telescope_id, discovery.discovery_year  
-            FROM planet
-            JOIN object ON planet.object_id = object.object_id
-            LEFT JOIN discovery ON planet.object_id = discovery.object_id 
-            WHERE planet.planet_name LIKE %s
-            UNION
-            SELECT miscellaneous.misc_name, miscellaneous.origin_system, UPPER(object.object_type), discovery.telescope_id, discovery.discovery_year  
-            FROM miscellaneous
-            JOIN object ON miscellaneous.object_id = object.object_id
-            LEFT JOIN discovery ON miscellaneous.object_id = discovery.object_id 
-            WHERE miscellaneous.misc_name LIKE %s
-        """
-        param = (keyword + "%", keyword + "%", keyword + "%")
-        cursor.execute(query, param)
-        result = cursor.fetchall()
-        # Build a list of dictionaries from the result set.
-        output = []
-        for row in result:
-            output.append({
-                "obj_name": row[0],
-                "obj_type": row[1],
-                "obj_loc": row[2],
-                "telescope": row[3],
-                "discovery": row[4],
-            })
-        return output
+        async with async_connection() as connection:
+            rows, next_cursor, total = await _search_page(
+                connection, GENERAL_COLUMNS, GENERAL_KINDS, keyword, mode, page,
+            )
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error during general search: " + str(e))
-    finally:
-        cursor.close()
-        connection.close()
+
+    # Build a list of dictionaries from the result set.
+    output = [_general_record(row) for row in rows]
+    response = _page_response(output, next_cursor, total)
+    search_cache.set(cache_key, response, generation)
+    return response
+
+GENERAL_COLUMNS = "name, origin_system, object_type, telescope_id, discovery_year"
+GENERAL_KINDS = ("star", "planet", "misc")
+
+def _general_record(row):
+    return {
+        "obj_name": row[0],
+        "obj_type": row[1],
+        "obj_loc": row[2],
+        "telescope": row[3],
+        "discovery": row[4],
+    }
 
 @app.post("/api/specifiedSearch")
 async def specified_search(request: Request):
@@ -78,99 +80,222 @@ async def specified_search(request: Request):
     filter_word = data.get("filter", "")
     if not keyword or not filter_word:
         raise HTTPException(status_code=400, detail="Keyword and filter are required")
+    mode = validate_mode(data.get("mode"))
+    page = parse_page(data, mode)
+    if filter_word not in ("star", "planet", "misc"):
+        raise HTTPException(status_code=400, detail="Invalid filter specified")
+    cache_key = search_cache.make_key("specified", filter_word, mode, keyword, page)
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = search_cache.generation()
     
-    connection = get_db_connection()
     try:
-        if filter_word == "star":
-            return search_star(keyword, connection)
-        elif filter_word == "planet":
-            return search_planet(keyword, connection)
-        elif filter_word == "misc":
-            return search_misc(keyword, connection)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid filter specified")
+        async with async_connection() as connection:
+            if filter_word == "star":
+                response = await search_star(keyword, connection, mode, page)
+            elif filter_word == "planet":
+                response = await search_planet(keyword, connection, mode, page)
+            else:
+                response = await search_misc(keyword, connection, mode, page)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error during specified search: " + str(e))
-    finally:
-        connection.close()
+    search_cache.set(cache_key, response, generation)
+    return response
 
-def search_star(keyword: str, connection):
-    cursor = connection.cursor()
-    try:
-        query = """
-            select star_name, stellar_class, solar_radii, solar_mass, system_type, distance
-            from star
-            join star_system on star.origin_system = star_system.system_name
-            where star_name like %s
-        """
-        cursor.execute(query, (keyword + "%",))
-        result = cursor.fetchall()
-        output = []
-        for row in result:
-            output.append({
-                "star_name": row[0],
-                "stellar_class": row[1],
-                "solar_radii": row[2],
-                "solar_mass": row[3],
-                "star_type": row[4],
-                "distance": row[5],
-            })
-        return output
-    finally:
-        cursor.close()
-
-def search_planet(keyword: str, connection):
-    cursor = connection.cursor()
+def _search_query(select_list: str, kinds, keyword: str, mode: str, page: PageRequest = None):
+    # catalogue_entry matches in keyset order. With a page, the sort key columns
+    # are appended to each row and one row past the page size is fetched only
+    # to tell whether a next page exists.
+    match, _ = name_match("name", mode)
+    after = page.after if page else None
+    sort_columns, after_predicate, order_by = keyset_clauses("name", mode, after)
+    params = search_params(keyword)
+    params.update(keyset_params(mode, after))
+    params["kinds"] = list(kinds)
+
+    if page is None:
+        return f"""
+            SELECT {select_list}
+            FROM catalogue_entry
+            WHERE kind = ANY(%(kinds)s)
+              AND {match}
+            ORDER BY {order_by}
+        """, params
+
+    params["limit"] = page.size + 1
+    return f"""
+        SELECT {select_list}, {sort_columns}
+        FROM catalogue_entry
+        WHERE kind = ANY(%(kinds)s)
+          AND {match}
+          {after_predicate}
+        ORDER BY {order_by}
+        LIMIT %(limit)s
+    """, params
+
+async def _search_page(connection, select_list: str, kinds, keyword: str, mode: str, page: PageRequest):
+    match, _ = name_match("name", mode)
+    query, params = _search_query(select_list, kinds, keyword, mode, page)
+    total = None
+    async with connection.cursor() as cursor:
+        await cursor.execute(query, params)
+        rows = await cursor.fetchall()
+        if page.include_total:
+            # Planner estimate rather than COUNT(*), so it stays cheap on large catalogues
+            await cursor.execute(
+                f"EXPLAIN (FORMAT JSON) SELECT 1 FROM catalogue_entry WHERE kind = ANY(%(kinds)s) AND {match}",
+                params,
+            )
+            plan = (await cursor.fetchone())[0]
+            total = int(plan[0]["Plan"]["Plan Rows"])
+
+    width = sort_key_width(mode)
+    next_cursor = None
+    if len(rows) > page.size:
+        rows = rows[:page.size]
+        next_cursor = encode_cursor(mode, list(rows[-1][-width:]))
+    return [row[:-width] for row in rows], next_cursor, total
+
+def _page_response(items, next_cursor, total):
+    response = {"items": items, "next_cursor": next_cursor}
+    if total is not None:
+        response["total_estimate"] = total
+    return response
+
+def _default_page():
+    return PageRequest(size=DEFAULT_PAGE_SIZE, after=None, include_total=False)
+
+STAR_COLUMNS = "name, category, radius, mass, system_type, distance"
+PLANET_COLUMNS = "name, origin_system, radius, mass, orbital_period, atmosphere"
+MISC_COLUMNS = """name, origin_system,
+           case when kind = 'satellite' then 'Satellite'
+                else REPLACE(UPPER(SUBSTR(category, 1, 1)) || LOWER(SUBSTR(REPLACE(category, '_', ' '), 2)), ' ', '')
+           end,
+           distance"""
+
+def _star_record(row):
+    return {
+        "star_name": row[0],
+        "stellar_class": row[1],
+        "solar_radii": row[2],
+        "solar_mass": row[3],
+        "star_type": row[4],
+        "distance": row[5],
+    }
+
+def _planet_record(row):
+    return {
+        "planet_name": row[0],
+        "parent_system": row[1],
+        "planet_radius": row[2],
+        "planet_mass": row[3],
+        "orbit": row[4],
+        "atmosphere": row[5],
+    }
+
+def _misc_record(row):
+    return {
+        "misc_name": row[0],
+        "parent_system": row[1],
+        "misc_category": row[2],
+        "distance": row[3],
+    }
+
+async def search_star(keyword: str, connection, mode: str = "prefix", page: PageRequest = None):
+    rows, next_cursor, total = await _search_page(
+        connection, STAR_COLUMNS, ("star",), keyword, mode, page or _default_page(),
+    )
+    return _page_response([_star_record(row) for row in rows], next_cursor, total)
+
+async def search_planet(keyword: str, connection, mode: str = "prefix", page: PageRequest = None):
+    rows, next_cursor, total = await _search_page(
+        connection, PLANET_COLUMNS, ("planet",), keyword, mode, page or _default_page(),
+    )
+    return _page_response([_planet_record(row) for row in rows], next_cursor, total)
+
+async def search_misc(keyword: str, connection, mode: str = "prefix", page: PageRequest = None):
+    rows, next_cursor, total = await _search_page(
+        connection, MISC_COLUMNS, ("misc", "satellite"), keyword, mode, page or _default_page(),
+    )
+    return _page_response([_misc_record(row) for row in rows], next_cursor, total)
+
+# filter -> (select list, catalogue kinds, row formatter); None is the general search
+SEARCH_FILTERS = {
+    None: (GENERAL_COLUMNS, GENERAL_KINDS, _general_record),
+    "star": (STAR_COLUMNS, ("star",), _star_record),
+    "planet": (PLANET_COLUMNS, ("planet",), _planet_record),
+    "misc": (MISC_COLUMNS, ("misc", "satellite"), _misc_record),
+}
+
+MAX_BATCH_KEYWORDS = 5000
+DEFAULT_BATCH_MATCHES = 10
+MAX_BATCH_MATCHES = 100
+
+@app.post("/api/batchSearch")
+async def batch_search(request: Request):
+    data = await request.json()
+    keywords = data.get("keywords")
+    filter_word = data.get("filter") or None
+    if not isinstance(keywords, list) or not keywords:
+        raise HTTPException(status_code=400, detail="keywords must be a non-empty list")
+    if len(keywords) > MAX_BATCH_KEYWORDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_KEYWORDS} keywords per request")
+    if filter_word not in SEARCH_FILTERS:
+        raise HTTPException(status_code=400, detail="Invalid filter specified")
     try:
-        query = """
-            select planet_name, origin_system, planetary_radii, planetary_mass, orbital_period, atmosphere
-            from planet
-            where planet_name like %s
-        """
-        cursor.execute(query, (keyword + "%",))
-        result = cursor.fetchall()
-        output = []
-        for row in result:
-            output.append({
-                "planet_name": row[0],
-                "parent_system": row[1],
-                "planet_radius": row[2],
-                "planet_mass": row[3],
-                "orbit": row[4],
-                "atmosphere": row[5],
-            })
-        return output
-    finally:
-        cursor.close()
-
-def search_misc(keyword: str, connection):
-    cursor = connection.cursor()
+        per_keyword = int(data.get("limit_per_keyword") or DEFAULT_BATCH_MATCHES)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="limit_per_keyword must be an integer")
+    per_keyword = max(1, min(per_keyword, MAX_BATCH_MATCHES))
+
+    # Each normalized keyword is searched once; its matches are returned under
+    # every spelling the caller sent for it ("Kepler" and "kepler" both get an entry)
+    spellings_by_normalized = {}
+    for keyword in keywords:
+        if isinstance(keyword, str) and keyword.strip():
+            spellings = spellings_by_normalized.setdefault(keyword.strip().lower(), [])
+            if keyword not in spellings:
+                spellings.append(keyword)
+    if not spellings_by_normalized:
+        raise HTTPException(status_code=400, detail="keywords must contain at least one non-empty string")
+    normalized = list(spellings_by_normalized)
+
+    select_list, kinds, to_record = SEARCH_FILTERS[filter_word]
+    # All keywords are resolved in one statement: unnest() turns the arrays into
+    # rows and the LATERAL subquery runs an index range scan per keyword. The
+    # sort columns are carried out so the outer ORDER BY keeps name order.
+    query = f"""
+        SELECT k.ord, m.*
+        FROM unnest(%(keywords)s::text[], %(patterns)s::text[]) WITH ORDINALITY AS k(keyword, pattern, ord)
+        CROSS JOIN LATERAL (
+            SELECT {select_list}, lower(name) AS sort_name, object_id AS sort_id
+            FROM catalogue_entry
+            WHERE kind = ANY(%(kinds)s)
+              AND lower(name) LIKE k.pattern
+            ORDER BY lower(name), object_id
+            LIMIT %(per_keyword)s
+        ) m
+        ORDER BY k.ord, m.sort_name, m.sort_id
+    """
+    params = {
+        "keywords": normalized,
+        "patterns": [search_params(keyword)["prefix"] for keyword in normalized],
+        "kinds": list(kinds),
+        "per_keyword": per_keyword,
+    }
     try:
-        query = """
-            select misc_name, origin_system, 
-                   REPLACE(UPPER(SUBSTR(misc_category, 1, 1)) || LOWER(SUBSTR(REPLACE(misc_category, '_', ' '), 2)), ' ', ''),
-                   distance
-            from miscellaneous
-            join star_system on miscellaneous.origin_system = star_system.system_name
-            where misc_name like %s
-            UNION
-            select satellite_name, planet.origin_system, 'Satellite', star_system.system_age
-            from satellite
-            join planet on satellite.parent_planet = planet.object_id
-            join star_system on planet.origin_system = star_system.system_name
-            where satellite_name like %s
-        """
-        # Provide the keyword for both parts of the UNION.
-        cursor.execute(query, (keyword + "%", keyword + "%"))
-        result = cursor.fetchall()
-        output = []
-        for row in result:
-            output.append({
-                "misc_name": row[0],
-                "parent_system": row[1],
-                "misc_category": row[2],
-                "distance": row[3],
-            })
-        return output
-    finally:
-        cursor.close()
+        async with async_connection() as connection, connection.cursor() as cursor:
+            await cursor.execute(query, params)
+            rows = await cursor.fetchall()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error during batch search: " + str(e))
+
+    matches = [[] for _ in normalized]
+    for row in rows:
+        matches[row[0] - 1].append(to_record(row[1:-2]))
+    results = {}
+    for keyword, keyword_matches in zip(normalized, matches):
+        for spelling in spellings_by_normalized[keyword]:
+            results[spelling] = keyword_matches
+    return {"results": results}
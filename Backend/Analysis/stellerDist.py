@@ -1,65 +1,64 @@
-import os
 import psycopg2
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from Backend.DB.Config import get_db_connection
+from Backend.DB.Columnar import fetch_columns
+from streaming import columnar, json_response
+from render_cache import chart_response
+from rendering import figure_template, new_figure, figure_to_png
 
-async def analyze_stellar_dist():
-    
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    
-    sql_query = """
-    WITH star_discoveries AS (
-        SELECT s.stellar_class,
-               COUNT(*) as star_count,
-               AVG(s.solar_mass) as avg_mass,
-               AVG(s.luminosity) as avg_luminosity,
-               MAX(d.discovery_year) as latest_discovery
-        FROM star s
-        LEFT JOIN discovery d ON s.object_id = d.object_id
-        GROUP BY s.stellar_class
-    ),
-    system_stats AS (
-        SELECT ss.system_type,
-               COUNT(DISTINCT s.object_id) as total_stars,
-               COUNT(DISTINCT p.object_id) as total_planets
-        FROM star_system ss
-        LEFT JOIN star s ON ss.system_name = s.origin_system
-        LEFT JOIN planet p ON ss.system_name = p.origin_system
-        GROUP BY ss.system_type
-        HAVING COUNT(DISTINCT s.object_id) > 0
-    )
-    SELECT sd.stellar_class,
-           sd.star_count,
-           sd.avg_mass,
-           sd.avg_luminosity,
-           sd.latest_discovery,
-           ss.total_planets
-    FROM star_discoveries sd
-    JOIN system_stats ss ON 1=1
-    ORDER BY sd.stellar_class;
-    """
-    
+# Both read the rollups maintained by SCHEMA/StellarRollups.py
+STELLAR_CLASS_QUERY = """
+SELECT NULLIF(r.stellar_class, '') AS stellar_class,
+       r.star_count,
+       r.mass_sum / NULLIF(r.mass_count, 0) AS avg_mass,
+       r.luminosity_sum / NULLIF(r.luminosity_count, 0) AS avg_luminosity,
+       (SELECT max(y.discovery_year)
+        FROM stellar_class_discovery_year y
+        WHERE y.stellar_class = r.stellar_class) AS latest_discovery
+FROM stellar_class_rollup r
+WHERE r.star_count > 0
+ORDER BY 1;
+"""
+
+SYSTEM_TYPE_QUERY = """
+SELECT NULLIF(system_type, '') AS system_type,
+       star_count AS total_stars,
+       planet_count AS total_planets
+FROM system_type_rollup
+WHERE star_count > 0
+ORDER BY 1;
+"""
+
+
+async def analyze_stellar_dist(inline=False, if_none_match=None):
     try:
-        
-        cur.execute(sql_query)
-        col_names = [desc[0] for desc in cur.description]  
-        results = cur.fetchall()
-        df = pd.DataFrame(results, columns=col_names)  
+        columns = await fetch_columns(STELLAR_CLASS_QUERY)
         
     except Exception as e:
         print(f"Problem executing SQL query from StellarDistFile: {e}")
         return
-    finally:
-        
-        cur.close()
-        conn.close()
 
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    return await chart_response("stellar_dist", {}, columns, _draw_stellar_dist, (columns,),
+                                inline=inline, if_none_match=if_none_match)
+
+
+async def stellar_dist_data():
+    return json_response({
+        "stellar_classes": columnar(await fetch_columns(STELLAR_CLASS_QUERY)),
+        "system_types": columnar(await fetch_columns(SYSTEM_TYPE_QUERY)),
+    })
+
+
+def _build_stellar_dist_figure():
+    fig = new_figure(figsize=(15, 6))
+    return fig, fig.subplots(1, 2)
+
+
+def _draw_stellar_dist(columns):
+    import seaborn as sns
+    import pandas as pd
+
+    df = pd.DataFrame(columns, copy=False)
+
+    fig, (ax1, ax2) = figure_template("stellar_dist", _build_stellar_dist_figure)
     
     
     sns.scatterplot(data=df, 
@@ -85,30 +84,6 @@ async def analyze_stellar_dist():
     ax2.set_ylabel('Year')
     
     
-    plt.tight_layout()
-
-    
-    image_path = '/home/shyan/Desktop/DbPostgresql/Backend/image/StellerDist.png'
-    
-    
-    if not os.path.exists(os.path.dirname(image_path)):
-        os.makedirs(os.path.dirname(image_path))
-    
-    try:
-        
-        plt.savefig(image_path)
-        print(f"Image saved to {image_path}")
-    except Exception as e:
-        print(f"Error saving image: {e}")
-    
-    plt.close()
-
-
-    return {
-        "message": "Image created successfully", 
-        "image_path": "http://127.0.0.1:8000/show-image-Planetsys"  
-    }
-    
-    
-
+    fig.tight_layout()
 
+    return figure_to_png(fig)
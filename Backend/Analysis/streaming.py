@@ -0,0 +1,57 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.responses import Response, StreamingResponse
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def _ndjson_lines(chunks, to_record):
+    async for rows in chunks:
+        yield "".join(json.dumps(to_record(row), default=_json_default) + "\n" for row in rows)
+
+
+def ndjson_response(chunks, to_record):
+    # One JSON object per line, written as each chunk of rows arrives from the database
+    return StreamingResponse(_ndjson_lines(chunks, to_record), media_type="application/x-ndjson")
+
+
+def wants_ndjson(format_value) -> bool:
+    return (format_value or "").lower() == "ndjson"
+
+
+def _column_values(array):
+    # NaN stands for NULL in the loader's float columns; JSON has no NaN
+    if array.dtype.kind == "f":
+        import numpy as np
+
+        nulls = np.isnan(array)
+        if nulls.any():
+            values = array.astype(object)
+            values[nulls] = None
+            return values.tolist()
+    return array.tolist()
+
+
+def columnar(columns):
+    # {"length": n, "columns": {name: [values...]}} from the {name: ndarray}
+    # of Backend.DB.Columnar -- one array per column rather than one object per
+    # row, so column names are sent once
+    length = len(next(iter(columns.values()))) if columns else 0
+    return {"length": length, "columns": {name: _column_values(array) for name, array in columns.items()}}
+
+
+def json_response(payload):
+    body = json.dumps(payload, default=_json_default, separators=(",", ":"))
+    return Response(content=body, media_type="application/json")
+
+
+def columnar_response(columns):
+    return json_response(columnar(columns))
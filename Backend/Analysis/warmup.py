@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from Backend.DB.AsyncDB import warm_async_pool, run_blocking
+from Backend.DB.ConnectionPool import get_pool
+from rendering import warm_render_pool
+
+WARMUP_RETRY_SECONDS = 5.0
+
+# Nothing below runs at import time: the API process starts serving as soon as
+# its modules are loaded, and the database pools and render workers are brought
+# up afterwards by warm_up(). /ready reports when that has finished.
+_ready = asyncio.Event()
+_warmup_task = None
+startup_timings = {}
+
+
+def record_timing(name, started):
+    startup_timings[name] = round(time.perf_counter() - started, 3)
+
+
+async def _warm_step(name, warm):
+    started = time.perf_counter()
+    try:
+        await warm()
+        startup_timings.pop(f"{name}_error", None)
+        return True
+    except Exception as e:
+        startup_timings[f"{name}_error"] = str(e)
+        print(f"Warmup step '{name}' failed: {e}")
+        return False
+    finally:
+        record_timing(f"{name}_seconds", started)
+
+
+async def warm_up():
+    started = time.perf_counter()
+    steps = {
+        "async_pool": warm_async_pool,
+        "sync_pool": lambda: run_blocking(get_pool),
+        "render_pool": warm_render_pool,
+    }
+    while steps:
+        results = await asyncio.gather(*(_warm_step(name, warm) for name, warm in steps.items()))
+        steps = {name: warm for (name, warm), ok in zip(steps.items(), results) if not ok}
+        if steps:
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+    record_timing("warmup_seconds", started)
+    _ready.set()
+    print(f"Warmup finished: {startup_timings}")
+
+
+def start_warmup():
+    global _warmup_task
+    if _warmup_task is None:
+        _warmup_task = asyncio.create_task(warm_up())
+
+
+async def stop_warmup():
+    global _warmup_task
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+        _warmup_task = None
+
+
+def is_ready():
+    return _ready.is_set()
@@ -0,0 +1,117 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from uuid import uuid4
+
+from psycopg_pool import AsyncConnectionPool
+
+from Backend.DB.Config import (
+    get_conninfo,
+    ASYNC_POOL_MIN_SIZE,
+    ASYNC_POOL_MAX_SIZE,
+    POOL_CHECKOUT_TIMEOUT,
+    BLOCKING_EXECUTOR_WORKERS,
+    STREAM_CHUNK_SIZE,
+)
+
+
+# asyncio-native counterpart of ConnectionPool.py, used by the `async def`
+# endpoints so a slow query only suspends its own request instead of
+# stalling the event loop for every client.
+_async_pool = None
+_async_pool_lock = asyncio.Lock()
+
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=BLOCKING_EXECUTOR_WORKERS,
+    thread_name_prefix="cosmos-blocking",
+)
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    global _async_pool
+    if _async_pool is None:
+        async with _async_pool_lock:
+            if _async_pool is None:
+                pool = AsyncConnectionPool(
+                    get_conninfo(),
+                    min_size=ASYNC_POOL_MIN_SIZE,
+                    max_size=ASYNC_POOL_MAX_SIZE,
+                    timeout=POOL_CHECKOUT_TIMEOUT,
+                    check=AsyncConnectionPool.check_connection,
+                    open=False,
+                )
+                await pool.open(wait=False)
+                _async_pool = pool
+    return _async_pool
+
+
+async def warm_async_pool(timeout=POOL_CHECKOUT_TIMEOUT):
+    # Opens the pool if needed and waits until its min_size connections exist
+    pool = await get_async_pool()
+    await pool.wait(timeout=timeout)
+
+
+@asynccontextmanager
+async def async_connection():
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+async def fetch_all(query, params=None):
+    async with async_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+
+async def fetch_one(query, params=None):
+    async with async_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params)
+            return await cur.fetchone()
+
+
+async def fetch_with_columns(query, params=None):
+    async with async_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, params)
+            rows = await cur.fetchall()
+            columns = [desc[0] for desc in cur.description]
+    return columns, rows
+
+
+async def stream_rows(query, params=None, chunk_size=STREAM_CHUNK_SIZE):
+    # Yields the result in chunks from a server-side (named) cursor, so only
+    # one chunk is held in memory however large the result is. The pooled
+    # connection stays checked out until the consumer is done.
+    async with async_connection() as conn:
+        async with conn.cursor(name=f"cosmos_stream_{uuid4().hex}") as cur:
+            cur.itersize = chunk_size
+            await cur.execute(query, params)
+            while True:
+                rows = await cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+
+async def run_blocking(func, *args, **kwargs):
+    # Blocking work (sync CRUD calls, chart rendering) goes to a bounded thread
+    # pool so the event loop keeps serving other requests meanwhile.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, partial(func, *args, **kwargs))
+
+
+def async_pool_stats():
+    if _async_pool is None:
+        return {"pool_size": 0, "pool_min": ASYNC_POOL_MIN_SIZE, "pool_max": ASYNC_POOL_MAX_SIZE}
+    return _async_pool.get_stats()
+
+
+async def close_async_pool():
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
@@ -0,0 +1,154 @@
+import queue
+import re
+from urllib.parse import quote
+
+from Backend.DB.Config import NEW_DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+from Backend.DB.ConnectionPool import pooled_connection
+from Backend.DB.AsyncDB import run_blocking
+
+
+# Column-wise loading for the chart and analysis code: query results come back
+# as {column name: NumPy array} instead of a list of row tuples. Results are
+# read through the ADBC PostgreSQL driver as Arrow and converted a whole
+# column at a time; NUMERIC/DECIMAL columns become float64 and NULLs in
+# numeric columns become NaN. ADBC's DB-API layer needs pyarrow (pinned in
+# requirements.txt). If either is missing the loader runs degraded: rows are
+# read through the regular connection pool and converted with the same typing.
+
+# PostgreSQL type OIDs, for the fallback path
+_FLOAT_OIDS = {700, 701, 1700}    # real, double precision, numeric
+_INT_OIDS = {20, 21, 23}          # bigint, smallint, integer
+_BOOL_OID = 16
+
+_PLACEHOLDER = re.compile(r"%%|%\((\w+)\)s|%s")
+
+_adbc_connections = queue.SimpleQueue()
+_adbc_available = None
+
+
+def _adbc_uri():
+    return (f"postgresql://{quote(DB_USER, safe='')}:{quote(DB_PASSWORD, safe='')}"
+            f"@{DB_HOST}:{DB_PORT}/{quote(NEW_DB_NAME, safe='')}")
+
+
+def _adbc_query(query, params):
+    # ADBC's PostgreSQL driver takes $1..$n placeholders; a named parameter
+    # used more than once keeps a single position
+    values = []
+    positions = {}
+
+    def placeholder(match):
+        if match.group(0) == "%%":
+            return "%"
+        if match.group(1) is None:
+            values.append(params[len(values)])
+            return f"${len(values)}"
+        name = match.group(1)
+        if name not in positions:
+            values.append(params[name])
+            positions[name] = len(values)
+        return f"${positions[name]}"
+
+    query = _PLACEHOLDER.sub(placeholder, query)
+    return query, tuple(values) or None
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def _adbc_table(conn, query, params):
+    with conn.cursor() as cur:
+        cur.execute(*_adbc_query(query, params))
+        return cur.fetch_arrow_table()
+
+
+def _adbc_columns(query, params):
+    import pyarrow as pa
+    from adbc_driver_postgresql import dbapi
+
+    try:
+        conn = _adbc_connections.get_nowait()
+    except queue.Empty:
+        conn = None
+    if conn is not None:
+        try:
+            table = _adbc_table(conn, query, params)
+        except Exception as e:
+            # An idle connection may have been dropped by the server (restart,
+            # idle timeout); retry once on a fresh one before failing the request
+            print(f"Pooled ADBC connection failed, retrying on a new one: {e}")
+            _close_quietly(conn)
+            conn = None
+    if conn is None:
+        conn = dbapi.connect(_adbc_uri(), autocommit=True)
+        try:
+            table = _adbc_table(conn, query, params)
+        except Exception:
+            _close_quietly(conn)
+            raise
+    _adbc_connections.put(conn)
+
+    columns = {}
+    for field, column in zip(table.schema, table.columns):
+        # The driver hands NUMERIC over as text, tagged with its type name
+        typname = (field.metadata or {}).get(b"ADBC:postgresql:typname")
+        if typname == b"numeric" or pa.types.is_decimal(field.type):
+            column = column.cast(pa.float64())
+        columns[field.name] = column.to_numpy()
+    return columns
+
+
+def _column_array(values, type_code):
+    import numpy as np
+
+    if type_code in _FLOAT_OIDS:
+        return np.array(values, dtype=np.float64)    # None -> NaN
+    has_nulls = any(value is None for value in values)
+    if type_code in _INT_OIDS:
+        return np.array(values, dtype=np.float64 if has_nulls else np.int64)
+    if type_code == _BOOL_OID and not has_nulls:
+        return np.array(values, dtype=bool)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _pooled_columns(query, params):
+    with pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+            description = cur.description
+    values = list(zip(*rows)) if rows else [()] * len(description)
+    return {desc[0]: _column_array(column, desc[1]) for desc, column in zip(description, values)}
+
+
+def load_columns(query, params=None):
+    # Blocking; takes the same %s / %(name)s parameters as the psycopg helpers
+    global _adbc_available
+    if _adbc_available is not False:
+        try:
+            columns = _adbc_columns(query, params)
+            _adbc_available = True
+            return columns
+        except ImportError:
+            _adbc_available = False
+            print("ADBC PostgreSQL driver or pyarrow not installed; loading columns row by row "
+                  "through the connection pool (degraded mode)")
+    return _pooled_columns(query, params)
+
+
+async def fetch_columns(query, params=None):
+    return await run_blocking(load_columns, query, params)
+
+
+def close_columnar_connections():
+    while True:
+        try:
+            _adbc_connections.get_nowait().close()
+        except queue.Empty:
+            break
@@ -7,6 +7,21 @@ DB_PASSWORD = "1234"
 DB_HOST = "localhost"
 DB_PORT = "5432"
 
+# Connection pool sizing (see Backend/DB/ConnectionPool.py)
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 20
+POOL_CHECKOUT_TIMEOUT = 10.0      # seconds a caller waits for a free connection
+POOL_HEALTH_CHECK_AFTER = 30.0    # ping idle connections older than this on borrow
+
+# Async pool used by the `async def` endpoints (see Backend/DB/AsyncDB.py)
+ASYNC_POOL_MIN_SIZE = 2
+ASYNC_POOL_MAX_SIZE = 20
+BLOCKING_EXECUTOR_WORKERS = 8     # threads for blocking work called from coroutines
+STREAM_CHUNK_SIZE = 2000          # rows fetched per round-trip by streaming responses
+
+def get_conninfo() -> str:
+    return f"dbname={NEW_DB_NAME} user={DB_USER} password={DB_PASSWORD} host={DB_HOST} port={DB_PORT}"
+
 def get_db_connection() -> connection:
     try:
         conn = psycopg2.connect(
@@ -0,0 +1,232 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from psycopg2 import extensions
+
+from Backend.DB.Config import (
+    get_db_connection,
+    POOL_MIN_SIZE,
+    POOL_MAX_SIZE,
+    POOL_CHECKOUT_TIMEOUT,
+    POOL_HEALTH_CHECK_AFTER,
+)
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PoolClosed(Exception):
+    pass
+
+
+# Thread-safe psycopg2 connection pool. Connections are opened on demand up to
+# max_size; callers that find the pool exhausted wait up to `timeout` seconds.
+# Idle connections older than `health_check_after` seconds are pinged before
+# being handed out and replaced if they have gone stale.
+class ConnectionPool:
+
+    def __init__(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE,
+                 timeout=POOL_CHECKOUT_TIMEOUT, health_check_after=POOL_HEALTH_CHECK_AFTER,
+                 connect=get_db_connection):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self._connect = connect
+
+        self._cond = threading.Condition()
+        self._idle = []          # (connection, last_returned) pairs, most recent last
+        self._size = 0           # connections owned by the pool, idle or in use
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def getconn(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise PoolClosed("Connection pool is closed")
+                    if self._idle:
+                        conn, last_returned = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # Reserve a slot; the connection is opened outside the lock.
+                        self._size += 1
+                        conn, last_returned = None, None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"No database connection available within {timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+
+        try:
+            if conn is not None and not self._is_healthy(conn, last_returned):
+                self._close_quietly(conn)
+                with self._cond:
+                    self._discarded += 1
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        elapsed = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            self._checkout_time_total += elapsed
+            self._checkout_time_max = max(self._checkout_time_max, elapsed)
+        return conn
+
+    def putconn(self, conn, discard=False):
+        if not discard:
+            discard = not self._reset(conn)
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+                self._discarded += 1 if discard else 0
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if discard or self._closed:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        except Exception:
+            self.putconn(conn, discard=bool(conn.closed))
+            raise
+        else:
+            self.putconn(conn)
+
+    def stats(self):
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "avg_checkout_ms": (self._checkout_time_total / checkouts * 1000) if checkouts else 0.0,
+                "max_checkout_ms": self._checkout_time_max * 1000,
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def _is_healthy(self, conn, last_returned):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_returned < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, conn):
+        # Hand connections back in a clean, non-autocommit, idle state.
+        if conn.closed:
+            return False
+        try:
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    # The pool is created on first use so importing this module never touches the database.
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def pooled_connection(timeout=None):
+    return get_pool().connection(timeout)
+
+
+def pool_stats():
+    if _pool is None:
+        # Same keys as ConnectionPool.stats(), before the pool has been created
+        return {"size": 0, "idle": 0, "in_use": 0, "waiting": 0,
+                "min_size": POOL_MIN_SIZE, "max_size": POOL_MAX_SIZE,
+                "checkouts": 0, "timeouts": 0, "discarded": 0,
+                "avg_checkout_ms": 0.0, "max_checkout_ms": 0.0}
+    return _pool.stats()
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
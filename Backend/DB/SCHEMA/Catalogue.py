@@ -0,0 +1,301 @@
+from Backend.DB.Config import get_db_connection
+
+def Catalogue():
+    # One denormalized row per star, planet, satellite and miscellaneous object,
+    # so search and listing endpoints read a single table instead of re-joining
+    # object/discovery/star_system on every call. Rows are kept current by the
+    # per-table triggers below; there is no periodic refresh.
+    catalogue_table_query = """
+    CREATE TABLE IF NOT EXISTS catalogue_entry (
+        object_id INT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        kind VARCHAR(10) NOT NULL CHECK (kind IN ('star', 'planet', 'satellite', 'misc')),
+        object_type VARCHAR(10),          -- UPPER(object.object_type)
+        category VARCHAR(20),             -- stellar_class for stars, misc_category for misc
+        origin_system VARCHAR(100),
+        system_type VARCHAR(20),
+        distance DECIMAL,                 -- star_system.distance of the origin system
+        radius DECIMAL,
+        mass DECIMAL,
+        orbital_period DECIMAL,
+        atmosphere CHAR(1),
+        discovery_year INT,               -- earliest discovery of the object
+        telescope_id VARCHAR(50)
+    );
+    """
+
+    catalogue_index_queries = [
+        "CREATE INDEX IF NOT EXISTS catalogue_entry_name_trgm_idx ON catalogue_entry USING gin (lower(name) gin_trgm_ops);",
+        "CREATE INDEX IF NOT EXISTS catalogue_entry_kind_name_idx ON catalogue_entry (kind, lower(name) text_pattern_ops);",
+        "CREATE INDEX IF NOT EXISTS catalogue_entry_name_idx ON catalogue_entry (lower(name) text_pattern_ops);",
+        # Keyset pagination order for prefix search (see search_engine.keyset_clauses)
+        "CREATE INDEX IF NOT EXISTS catalogue_entry_kind_name_order_idx ON catalogue_entry (kind, lower(name), object_id);",
+        "CREATE INDEX IF NOT EXISTS catalogue_entry_origin_system_idx ON catalogue_entry (origin_system);",
+    ]
+
+    upsert_function_query = """
+    CREATE OR REPLACE FUNCTION catalogue_upsert(
+        p_object_id INT, p_name VARCHAR, p_kind VARCHAR, p_category VARCHAR, p_origin_system VARCHAR,
+        p_radius DECIMAL, p_mass DECIMAL, p_orbital_period DECIMAL, p_atmosphere CHAR
+    )
+    RETURNS VOID AS $$
+    BEGIN
+        INSERT INTO catalogue_entry (object_id, name, kind, object_type, category, origin_system, system_type,
+                                     distance, radius, mass, orbital_period, atmosphere, discovery_year, telescope_id)
+        SELECT p_object_id, p_name, p_kind,
+               (SELECT UPPER(o.object_type) FROM object o WHERE o.object_id = p_object_id),
+               p_category, p_origin_system, ss.system_type, ss.distance,
+               p_radius, p_mass, p_orbital_period, p_atmosphere,
+               d.discovery_year, d.telescope_id
+        FROM (SELECT 1) one
+        LEFT JOIN star_system ss ON ss.system_name = p_origin_system
+        LEFT JOIN LATERAL (
+            SELECT discovery_year, telescope_id FROM discovery
+            WHERE object_id = p_object_id
+            ORDER BY discovery_year, telescope_id
+            LIMIT 1
+        ) d ON true
+        ON CONFLICT (object_id) DO UPDATE SET
+            name = EXCLUDED.name,
+            kind = EXCLUDED.kind,
+            object_type = EXCLUDED.object_type,
+            category = EXCLUDED.category,
+            origin_system = EXCLUDED.origin_system,
+            system_type = EXCLUDED.system_type,
+            distance = EXCLUDED.distance,
+            radius = EXCLUDED.radius,
+            mass = EXCLUDED.mass,
+            orbital_period = EXCLUDED.orbital_period,
+            atmosphere = EXCLUDED.atmosphere,
+            discovery_year = EXCLUDED.discovery_year,
+            telescope_id = EXCLUDED.telescope_id;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    star_function_query = """
+    CREATE OR REPLACE FUNCTION star_catalogue_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            IF TG_OP = 'DELETE' OR OLD.object_id <> NEW.object_id THEN
+                DELETE FROM catalogue_entry WHERE object_id = OLD.object_id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+        END IF;
+        PERFORM catalogue_upsert(NEW.object_id, NEW.star_name, 'star', NEW.stellar_class, NEW.origin_system,
+                                 NEW.solar_radii, NEW.solar_mass, NULL, NULL);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    planet_function_query = """
+    CREATE OR REPLACE FUNCTION planet_catalogue_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            IF TG_OP = 'DELETE' OR OLD.object_id <> NEW.object_id THEN
+                DELETE FROM catalogue_entry WHERE object_id = OLD.object_id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+        END IF;
+        PERFORM catalogue_upsert(NEW.object_id, NEW.planet_name, 'planet', NULL, NEW.origin_system,
+                                 NEW.planetary_radii, NEW.planetary_mass, NEW.orbital_period, NEW.atmosphere);
+
+        -- Satellites inherit their origin system from the parent planet
+        IF TG_OP = 'UPDATE' AND NEW.origin_system IS DISTINCT FROM OLD.origin_system THEN
+            UPDATE catalogue_entry ce
+            SET origin_system = NEW.origin_system,
+                system_type = ss.system_type,
+                distance = ss.distance
+            FROM satellite s
+            LEFT JOIN star_system ss ON ss.system_name = NEW.origin_system
+            WHERE s.parent_planet = NEW.object_id
+              AND ce.object_id = s.object_id;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    satellite_function_query = """
+    CREATE OR REPLACE FUNCTION satellite_catalogue_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            IF TG_OP = 'DELETE' OR OLD.object_id <> NEW.object_id THEN
+                DELETE FROM catalogue_entry WHERE object_id = OLD.object_id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+        END IF;
+        PERFORM catalogue_upsert(NEW.object_id, NEW.satellite_name, 'satellite', NULL,
+                                 (SELECT p.origin_system FROM planet p WHERE p.object_id = NEW.parent_planet),
+                                 NEW.satellite_radii, NEW.satellite_mass, NEW.orbital_period, NEW.atmosphere);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    misc_function_query = """
+    CREATE OR REPLACE FUNCTION miscellaneous_catalogue_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            IF TG_OP = 'DELETE' OR OLD.object_id <> NEW.object_id THEN
+                DELETE FROM catalogue_entry WHERE object_id = OLD.object_id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+        END IF;
+        PERFORM catalogue_upsert(NEW.object_id, NEW.misc_name, 'misc', NEW.misc_category, NEW.origin_system,
+                                 NULL, NULL, NULL, NULL);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    discovery_function_query = """
+    CREATE OR REPLACE FUNCTION discovery_catalogue_trigger_function()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        affected INT;
+    BEGIN
+        FOREACH affected IN ARRAY ARRAY[
+            CASE WHEN TG_OP <> 'INSERT' THEN OLD.object_id END,
+            CASE WHEN TG_OP <> 'DELETE' THEN NEW.object_id END
+        ] LOOP
+            CONTINUE WHEN affected IS NULL;
+            UPDATE catalogue_entry
+            SET (discovery_year, telescope_id) = (
+                SELECT discovery_year, telescope_id FROM discovery
+                WHERE object_id = affected
+                ORDER BY discovery_year, telescope_id
+                LIMIT 1
+            )
+            WHERE object_id = affected;
+        END LOOP;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    star_system_function_query = """
+    CREATE OR REPLACE FUNCTION star_system_catalogue_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        UPDATE catalogue_entry
+        SET distance = NEW.distance,
+            system_type = NEW.system_type
+        WHERE origin_system = NEW.system_name;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    trigger_queries = [
+        """
+        DROP TRIGGER IF EXISTS star_catalogue_trigger ON star;
+        CREATE TRIGGER star_catalogue_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON star
+        FOR EACH ROW
+        EXECUTE FUNCTION star_catalogue_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS planet_catalogue_trigger ON planet;
+        CREATE TRIGGER planet_catalogue_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON planet
+        FOR EACH ROW
+        EXECUTE FUNCTION planet_catalogue_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS satellite_catalogue_trigger ON satellite;
+        CREATE TRIGGER satellite_catalogue_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON satellite
+        FOR EACH ROW
+        EXECUTE FUNCTION satellite_catalogue_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS miscellaneous_catalogue_trigger ON miscellaneous;
+        CREATE TRIGGER miscellaneous_catalogue_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON miscellaneous
+        FOR EACH ROW
+        EXECUTE FUNCTION miscellaneous_catalogue_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS discovery_catalogue_trigger ON discovery;
+        CREATE TRIGGER discovery_catalogue_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON discovery
+        FOR EACH ROW
+        EXECUTE FUNCTION discovery_catalogue_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS star_system_catalogue_trigger ON star_system;
+        CREATE TRIGGER star_system_catalogue_trigger
+        AFTER UPDATE OF distance, system_type ON star_system
+        FOR EACH ROW
+        EXECUTE FUNCTION star_system_catalogue_trigger_function();
+        """,
+    ]
+
+    # One-off load of objects that existed before the triggers were installed
+    backfill_query = """
+    SELECT catalogue_upsert(object_id, star_name, 'star', stellar_class, origin_system,
+                            solar_radii, solar_mass, NULL, NULL)
+    FROM star;
+    SELECT catalogue_upsert(object_id, planet_name, 'planet', NULL, origin_system,
+                            planetary_radii, planetary_mass, orbital_period, atmosphere)
+    FROM planet;
+    SELECT catalogue_upsert(s.object_id, s.satellite_name, 'satellite', NULL, p.origin_system,
+                            s.satellite_radii, s.satellite_mass, s.orbital_period, s.atmosphere)
+    FROM satellite s
+    LEFT JOIN planet p ON s.parent_planet = p.object_id;
+    SELECT catalogue_upsert(object_id, misc_name, 'misc', misc_category, origin_system,
+                            NULL, NULL, NULL, NULL)
+    FROM miscellaneous;
+    """
+
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        # The name indexes use trigram operator classes
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+        # Create the catalogue table and its indexes
+        cur.execute(catalogue_table_query)
+        for query in catalogue_index_queries:
+            cur.execute(query)
+        print("The Catalogue table has been created successfully.")
+
+        # Create the trigger functions
+        for query in (upsert_function_query, star_function_query, planet_function_query,
+                      satellite_function_query, misc_function_query, discovery_function_query,
+                      star_system_function_query):
+            cur.execute(query)
+        print("The trigger functions for the Catalogue table have been created successfully.")
+
+        # Create the triggers
+        for query in trigger_queries:
+            cur.execute(query)
+        print("The triggers for the Catalogue table have been created successfully.")
+
+        cur.execute(backfill_query)
+        print("The Catalogue table has been populated successfully.")
+
+        conn.commit()
+    except Exception as e:
+        print(f"An error occurred in the Catalogue table setup: {e}")
+        conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
@@ -0,0 +1,74 @@
+from Backend.DB.Config import get_db_connection
+
+# Channel the API listens on to keep its in-memory name index current
+CATALOGUE_NAMES_CHANNEL = "catalogue_names"
+
+
+def CatalogueNotify():
+    # catalogue_entry is written by the star/planet/satellite/miscellaneous
+    # triggers, so one trigger here covers every insert, rename and delete path.
+    # Updates that keep the name, kind and id (mass, luminosity, system, ...)
+    # send a single 'update' event, so other workers can drop cached search
+    # pages for that name without touching their name index.
+    notify_function_query = f"""
+    CREATE OR REPLACE FUNCTION catalogue_notify_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.name IS NOT DISTINCT FROM NEW.name
+           AND OLD.kind IS NOT DISTINCT FROM NEW.kind
+           AND OLD.object_id IS NOT DISTINCT FROM NEW.object_id THEN
+            PERFORM pg_notify('{CATALOGUE_NAMES_CHANNEL}', json_build_object(
+                'op', 'update', 'object_id', NEW.object_id, 'name', NEW.name, 'kind', NEW.kind)::text);
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM pg_notify('{CATALOGUE_NAMES_CHANNEL}', json_build_object(
+                'op', 'remove', 'object_id', OLD.object_id, 'name', OLD.name, 'kind', OLD.kind)::text);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM pg_notify('{CATALOGUE_NAMES_CHANNEL}', json_build_object(
+                'op', 'add', 'object_id', NEW.object_id, 'name', NEW.name, 'kind', NEW.kind)::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    notify_trigger_queries = [
+        """
+        DROP TRIGGER IF EXISTS catalogue_notify_insert_delete_trigger ON catalogue_entry;
+        CREATE TRIGGER catalogue_notify_insert_delete_trigger
+        AFTER INSERT OR DELETE ON catalogue_entry
+        FOR EACH ROW
+        EXECUTE FUNCTION catalogue_notify_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS catalogue_notify_update_trigger ON catalogue_entry;
+        CREATE TRIGGER catalogue_notify_update_trigger
+        AFTER UPDATE ON catalogue_entry
+        FOR EACH ROW
+        WHEN (OLD.* IS DISTINCT FROM NEW.*)
+        EXECUTE FUNCTION catalogue_notify_trigger_function();
+        """,
+    ]
+
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        cur.execute(notify_function_query)
+        print("The notify function for the Catalogue table has been created successfully.")
+
+        for query in notify_trigger_queries:
+            cur.execute(query)
+        print("The notify triggers for the Catalogue table have been created successfully.")
+
+        conn.commit()
+    except Exception as e:
+        print(f"An error occurred in the Catalogue notify setup: {e}")
+        conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
@@ -0,0 +1,129 @@
+from Backend.DB.Config import get_db_connection
+
+def DiscoveryCube():
+    # Discoveries counted per (year, telescope, object type), kept current by
+    # row triggers on discovery and object so the discovery timeline reads the
+    # cube instead of grouping the whole discovery log. Discoveries without a
+    # telescope or object type are stored under '' (read back as NULL).
+    cube_table_query = """
+    CREATE TABLE IF NOT EXISTS discovery_cube (
+        discovery_year INT NOT NULL,
+        telescope_id VARCHAR(50) NOT NULL,
+        object_type VARCHAR(4) NOT NULL,
+        discoveries INT NOT NULL,
+        PRIMARY KEY (discovery_year, telescope_id, object_type)
+    );
+    """
+
+    # Per-telescope series
+    cube_index_query = """
+    CREATE INDEX IF NOT EXISTS discovery_cube_telescope_idx
+    ON discovery_cube (telescope_id, discovery_year);
+    """
+
+    apply_function_query = """
+    CREATE OR REPLACE FUNCTION discovery_cube_apply(p_year INT, p_telescope VARCHAR, p_object_type VARCHAR, p_delta INT)
+    RETURNS VOID AS $$
+    BEGIN
+        INSERT INTO discovery_cube AS c (discovery_year, telescope_id, object_type, discoveries)
+        VALUES (p_year, COALESCE(p_telescope, ''), COALESCE(trim(p_object_type), ''), p_delta)
+        ON CONFLICT (discovery_year, telescope_id, object_type) DO UPDATE SET
+            discoveries = c.discoveries + EXCLUDED.discoveries;
+        DELETE FROM discovery_cube
+        WHERE discovery_year = p_year AND telescope_id = COALESCE(p_telescope, '')
+        AND object_type = COALESCE(trim(p_object_type), '') AND discoveries <= 0;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    discovery_function_query = """
+    CREATE OR REPLACE FUNCTION discovery_cube_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND (NEW.object_id, NEW.telescope_id, NEW.discovery_year)
+                IS NOT DISTINCT FROM (OLD.object_id, OLD.telescope_id, OLD.discovery_year) THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM discovery_cube_apply(OLD.discovery_year, OLD.telescope_id,
+                                         (SELECT object_type FROM object WHERE object_id = OLD.object_id), -1);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM discovery_cube_apply(NEW.discovery_year, NEW.telescope_id,
+                                         (SELECT object_type FROM object WHERE object_id = NEW.object_id), 1);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    object_function_query = """
+    CREATE OR REPLACE FUNCTION object_discovery_cube_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        PERFORM discovery_cube_apply(d.discovery_year, d.telescope_id, OLD.object_type, -1),
+                discovery_cube_apply(d.discovery_year, d.telescope_id, NEW.object_type, 1)
+        FROM discovery d WHERE d.object_id = NEW.object_id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    trigger_queries = [
+        """
+        DROP TRIGGER IF EXISTS discovery_cube_trigger ON discovery;
+        CREATE TRIGGER discovery_cube_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON discovery
+        FOR EACH ROW
+        EXECUTE FUNCTION discovery_cube_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS object_discovery_cube_trigger ON object;
+        CREATE TRIGGER object_discovery_cube_trigger
+        AFTER UPDATE OF object_type ON object
+        FOR EACH ROW
+        WHEN (OLD.object_type IS DISTINCT FROM NEW.object_type)
+        EXECUTE FUNCTION object_discovery_cube_trigger_function();
+        """,
+    ]
+
+    # One-off load of the rows that existed before the triggers were installed
+    backfill_query = """
+    INSERT INTO discovery_cube (discovery_year, telescope_id, object_type, discoveries)
+    SELECT d.discovery_year, COALESCE(d.telescope_id, ''), COALESCE(trim(o.object_type), ''), count(*)
+    FROM discovery d
+    LEFT JOIN object o ON o.object_id = d.object_id
+    GROUP BY d.discovery_year, COALESCE(d.telescope_id, ''), COALESCE(trim(o.object_type), '');
+    """
+
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        # Create the cube table and its index
+        cur.execute(cube_table_query)
+        cur.execute(cube_index_query)
+        print("The DiscoveryCube table has been created successfully.")
+
+        # Create the trigger functions
+        for query in (apply_function_query, discovery_function_query, object_function_query):
+            cur.execute(query)
+        print("The trigger functions for the DiscoveryCube table have been created successfully.")
+
+        # Create the triggers
+        for query in trigger_queries:
+            cur.execute(query)
+        print("The triggers for the DiscoveryCube table have been created successfully.")
+
+        cur.execute(backfill_query)
+        print("The DiscoveryCube table has been populated successfully.")
+
+        conn.commit()
+    except Exception as e:
+        print(f"An error occurred in the DiscoveryCube table setup: {e}")
+        conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
@@ -0,0 +1,47 @@
+from Backend.DB.Config import get_db_connection
+
+# Name columns served by Backend/Analysis/search_engine.py
+SEARCHABLE_NAME_COLUMNS = (
+    ("star", "star_name"),
+    ("planet", "planet_name"),
+    ("miscellaneous", "misc_name"),
+    ("satellite", "satellite_name"),
+)
+
+
+def SearchIndexes():
+    extension_query = "CREATE EXTENSION IF NOT EXISTS pg_trgm;"
+
+    # Trigram GIN indexes serve infix LIKE and similarity (<%) matches; the
+    # text_pattern_ops btree serves anchored prefix LIKE and ordered name scans.
+    index_queries = []
+    for table, column in SEARCHABLE_NAME_COLUMNS:
+        index_queries.append(f"""
+        CREATE INDEX IF NOT EXISTS {table}_{column}_trgm_idx
+        ON {table} USING gin (lower({column}) gin_trgm_ops);
+        """)
+        index_queries.append(f"""
+        CREATE INDEX IF NOT EXISTS {table}_{column}_prefix_idx
+        ON {table} (lower({column}) text_pattern_ops);
+        """)
+
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        cur.execute(extension_query)
+        print("The pg_trgm extension is available.")
+
+        for query in index_queries:
+            cur.execute(query)
+        print("The search indexes have been created successfully.")
+
+        conn.commit()
+    except Exception as e:
+        print(f"An error occurred while creating the search indexes: {e}")
+        conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
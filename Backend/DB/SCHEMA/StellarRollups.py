@@ -0,0 +1,259 @@
+from Backend.DB.Config import get_db_connection
+
+def StellarRollups():
+    # Per-stellar-class and per-system-type aggregates for the stellar
+    # distribution analysis, kept current by row triggers on star, planet,
+    # discovery and star_system so the chart reads a handful of rows instead of
+    # grouping the whole catalogue. Stars without a class and systems without
+    # a type are stored under '' (read back as NULL).
+    rollup_table_queries = [
+        """
+        CREATE TABLE IF NOT EXISTS stellar_class_rollup (
+            stellar_class VARCHAR(1) PRIMARY KEY,
+            star_count INT NOT NULL DEFAULT 0,
+            mass_sum DECIMAL NOT NULL DEFAULT 0,
+            mass_count INT NOT NULL DEFAULT 0,            -- stars with a known solar_mass
+            luminosity_sum DECIMAL NOT NULL DEFAULT 0,
+            luminosity_count INT NOT NULL DEFAULT 0       -- stars with a known luminosity
+        );
+        """,
+        # Discoveries of stars per class and year; the latest discovery of a
+        # class is the max year here, which stays correct when rows are deleted
+        """
+        CREATE TABLE IF NOT EXISTS stellar_class_discovery_year (
+            stellar_class VARCHAR(1) NOT NULL,
+            discovery_year INT NOT NULL,
+            discoveries INT NOT NULL,
+            PRIMARY KEY (stellar_class, discovery_year)
+        );
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS system_type_rollup (
+            system_type VARCHAR(20) PRIMARY KEY,
+            star_count INT NOT NULL DEFAULT 0,
+            planet_count INT NOT NULL DEFAULT 0
+        );
+        """,
+    ]
+
+    apply_function_queries = [
+        """
+        CREATE OR REPLACE FUNCTION stellar_class_rollup_apply(
+            p_class VARCHAR, p_sign INT, p_mass DECIMAL, p_luminosity DECIMAL
+        )
+        RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO stellar_class_rollup AS r (stellar_class, star_count, mass_sum, mass_count,
+                                                   luminosity_sum, luminosity_count)
+            VALUES (COALESCE(p_class, ''), p_sign,
+                    COALESCE(p_sign * p_mass, 0), CASE WHEN p_mass IS NULL THEN 0 ELSE p_sign END,
+                    COALESCE(p_sign * p_luminosity, 0), CASE WHEN p_luminosity IS NULL THEN 0 ELSE p_sign END)
+            ON CONFLICT (stellar_class) DO UPDATE SET
+                star_count = r.star_count + EXCLUDED.star_count,
+                mass_sum = r.mass_sum + EXCLUDED.mass_sum,
+                mass_count = r.mass_count + EXCLUDED.mass_count,
+                luminosity_sum = r.luminosity_sum + EXCLUDED.luminosity_sum,
+                luminosity_count = r.luminosity_count + EXCLUDED.luminosity_count;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION stellar_class_discovery_apply(p_class VARCHAR, p_year INT, p_delta INT)
+        RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO stellar_class_discovery_year AS y (stellar_class, discovery_year, discoveries)
+            VALUES (COALESCE(p_class, ''), p_year, p_delta)
+            ON CONFLICT (stellar_class, discovery_year) DO UPDATE SET
+                discoveries = y.discoveries + EXCLUDED.discoveries;
+            DELETE FROM stellar_class_discovery_year
+            WHERE stellar_class = COALESCE(p_class, '') AND discovery_year = p_year AND discoveries <= 0;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION system_type_rollup_apply(p_system_type VARCHAR, p_stars INT, p_planets INT)
+        RETURNS VOID AS $$
+        BEGIN
+            INSERT INTO system_type_rollup AS r (system_type, star_count, planet_count)
+            VALUES (COALESCE(p_system_type, ''), p_stars, p_planets)
+            ON CONFLICT (system_type) DO UPDATE SET
+                star_count = r.star_count + EXCLUDED.star_count,
+                planet_count = r.planet_count + EXCLUDED.planet_count;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+    ]
+
+    star_function_query = """
+    CREATE OR REPLACE FUNCTION star_rollup_trigger_function()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        discovered RECORD;
+    BEGIN
+        IF TG_OP = 'UPDATE' AND (NEW.object_id, NEW.stellar_class, NEW.solar_mass, NEW.luminosity, NEW.origin_system)
+                IS NOT DISTINCT FROM (OLD.object_id, OLD.stellar_class, OLD.solar_mass, OLD.luminosity, OLD.origin_system) THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM stellar_class_rollup_apply(OLD.stellar_class, -1, OLD.solar_mass, OLD.luminosity);
+            PERFORM system_type_rollup_apply(
+                (SELECT system_type FROM star_system WHERE system_name = OLD.origin_system), -1, 0);
+            FOR discovered IN SELECT discovery_year FROM discovery WHERE object_id = OLD.object_id LOOP
+                PERFORM stellar_class_discovery_apply(OLD.stellar_class, discovered.discovery_year, -1);
+            END LOOP;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM stellar_class_rollup_apply(NEW.stellar_class, 1, NEW.solar_mass, NEW.luminosity);
+            PERFORM system_type_rollup_apply(
+                (SELECT system_type FROM star_system WHERE system_name = NEW.origin_system), 1, 0);
+            FOR discovered IN SELECT discovery_year FROM discovery WHERE object_id = NEW.object_id LOOP
+                PERFORM stellar_class_discovery_apply(NEW.stellar_class, discovered.discovery_year, 1);
+            END LOOP;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    planet_function_query = """
+    CREATE OR REPLACE FUNCTION planet_rollup_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND NEW.origin_system IS NOT DISTINCT FROM OLD.origin_system THEN
+            RETURN NULL;
+        END IF;
+        -- Planets outside any system are not counted, matching the backfill
+        IF TG_OP <> 'INSERT' AND OLD.origin_system IS NOT NULL THEN
+            PERFORM system_type_rollup_apply(
+                (SELECT system_type FROM star_system WHERE system_name = OLD.origin_system), 0, -1);
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.origin_system IS NOT NULL THEN
+            PERFORM system_type_rollup_apply(
+                (SELECT system_type FROM star_system WHERE system_name = NEW.origin_system), 0, 1);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    discovery_function_query = """
+    CREATE OR REPLACE FUNCTION discovery_rollup_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM stellar_class_discovery_apply(s.stellar_class, OLD.discovery_year, -1)
+            FROM star s WHERE s.object_id = OLD.object_id;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM stellar_class_discovery_apply(s.stellar_class, NEW.discovery_year, 1)
+            FROM star s WHERE s.object_id = NEW.object_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    star_system_function_query = """
+    CREATE OR REPLACE FUNCTION star_system_rollup_trigger_function()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        stars INT;
+        planets INT;
+    BEGIN
+        SELECT count(*) INTO stars FROM star WHERE origin_system = NEW.system_name;
+        SELECT count(*) INTO planets FROM planet WHERE origin_system = NEW.system_name;
+        PERFORM system_type_rollup_apply(OLD.system_type, -stars, -planets);
+        PERFORM system_type_rollup_apply(NEW.system_type, stars, planets);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    trigger_queries = [
+        """
+        DROP TRIGGER IF EXISTS star_rollup_trigger ON star;
+        CREATE TRIGGER star_rollup_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON star
+        FOR EACH ROW
+        EXECUTE FUNCTION star_rollup_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS planet_rollup_trigger ON planet;
+        CREATE TRIGGER planet_rollup_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON planet
+        FOR EACH ROW
+        EXECUTE FUNCTION planet_rollup_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS discovery_rollup_trigger ON discovery;
+        CREATE TRIGGER discovery_rollup_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON discovery
+        FOR EACH ROW
+        EXECUTE FUNCTION discovery_rollup_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS star_system_rollup_trigger ON star_system;
+        CREATE TRIGGER star_system_rollup_trigger
+        AFTER UPDATE OF system_type ON star_system
+        FOR EACH ROW
+        WHEN (OLD.system_type IS DISTINCT FROM NEW.system_type)
+        EXECUTE FUNCTION star_system_rollup_trigger_function();
+        """,
+    ]
+
+    # One-off load of the rows that existed before the triggers were installed
+    backfill_query = """
+    INSERT INTO stellar_class_rollup (stellar_class, star_count, mass_sum, mass_count,
+                                      luminosity_sum, luminosity_count)
+    SELECT COALESCE(stellar_class, ''), count(*),
+           COALESCE(sum(solar_mass), 0), count(solar_mass),
+           COALESCE(sum(luminosity), 0), count(luminosity)
+    FROM star
+    GROUP BY COALESCE(stellar_class, '');
+
+    INSERT INTO stellar_class_discovery_year (stellar_class, discovery_year, discoveries)
+    SELECT COALESCE(s.stellar_class, ''), d.discovery_year, count(*)
+    FROM star s
+    JOIN discovery d ON d.object_id = s.object_id
+    GROUP BY COALESCE(s.stellar_class, ''), d.discovery_year;
+
+    INSERT INTO system_type_rollup (system_type, star_count, planet_count)
+    SELECT COALESCE(ss.system_type, ''),
+           sum((SELECT count(*) FROM star s WHERE s.origin_system = ss.system_name)),
+           sum((SELECT count(*) FROM planet p WHERE p.origin_system = ss.system_name))
+    FROM star_system ss
+    GROUP BY COALESCE(ss.system_type, '');
+    """
+
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        # Create the rollup tables
+        for query in rollup_table_queries:
+            cur.execute(query)
+        print("The stellar rollup tables have been created successfully.")
+
+        # Create the trigger functions
+        for query in apply_function_queries + [star_function_query, planet_function_query,
+                                               discovery_function_query, star_system_function_query]:
+            cur.execute(query)
+        print("The trigger functions for the stellar rollup tables have been created successfully.")
+
+        # Create the triggers
+        for query in trigger_queries:
+            cur.execute(query)
+        print("The triggers for the stellar rollup tables have been created successfully.")
+
+        cur.execute(backfill_query)
+        print("The stellar rollup tables have been populated successfully.")
+
+        conn.commit()
+    except Exception as e:
+        print(f"An error occurred in the stellar rollup table setup: {e}")
+        conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
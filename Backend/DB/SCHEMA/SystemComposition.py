@@ -0,0 +1,291 @@
+from Backend.DB.Config import get_db_connection
+
+def SystemComposition():
+    # One row per star system with its object counts and mass sums, kept
+    # current by row triggers on planet, satellite, miscellaneous and star.
+    # Averages are sum / count of the known values; system type and age are
+    # joined from star_system when reading. Satellites count towards the
+    # system of their parent planet and move with it.
+    composition_table_query = """
+    CREATE TABLE IF NOT EXISTS system_composition (
+        system_name VARCHAR(100) PRIMARY KEY,
+        planet_count INT NOT NULL DEFAULT 0,
+        planets_with_atmosphere INT NOT NULL DEFAULT 0,
+        planet_mass_sum DECIMAL NOT NULL DEFAULT 0,
+        planet_mass_count INT NOT NULL DEFAULT 0,
+        satellite_count INT NOT NULL DEFAULT 0,
+        satellite_mass_sum DECIMAL NOT NULL DEFAULT 0,
+        satellite_mass_count INT NOT NULL DEFAULT 0,
+        asteroid_count INT NOT NULL DEFAULT 0,
+        comet_count INT NOT NULL DEFAULT 0,
+        black_hole_count INT NOT NULL DEFAULT 0,
+        fgk_star_count INT NOT NULL DEFAULT 0         -- stars of class F, G or K
+    );
+    """
+
+    # Serves the planetary-systems analysis: systems with planets and an F/G/K star, by planet count
+    composition_index_query = """
+    CREATE INDEX IF NOT EXISTS system_composition_fgk_planets_idx
+    ON system_composition (planet_count DESC)
+    WHERE planet_count > 0 AND fgk_star_count > 0;
+    """
+
+    apply_function_query = """
+    CREATE OR REPLACE FUNCTION system_composition_apply(
+        p_system VARCHAR,
+        p_planets INT DEFAULT 0, p_planets_with_atmosphere INT DEFAULT 0,
+        p_planet_mass_sum DECIMAL DEFAULT 0, p_planet_mass_count INT DEFAULT 0,
+        p_satellites INT DEFAULT 0, p_satellite_mass_sum DECIMAL DEFAULT 0, p_satellite_mass_count INT DEFAULT 0,
+        p_asteroids INT DEFAULT 0, p_comets INT DEFAULT 0, p_black_holes INT DEFAULT 0,
+        p_fgk_stars INT DEFAULT 0
+    )
+    RETURNS VOID AS $$
+    BEGIN
+        IF p_system IS NULL THEN
+            RETURN;
+        END IF;
+        INSERT INTO system_composition AS c (
+            system_name, planet_count, planets_with_atmosphere, planet_mass_sum, planet_mass_count,
+            satellite_count, satellite_mass_sum, satellite_mass_count,
+            asteroid_count, comet_count, black_hole_count, fgk_star_count
+        )
+        VALUES (p_system, p_planets, p_planets_with_atmosphere, p_planet_mass_sum, p_planet_mass_count,
+                p_satellites, p_satellite_mass_sum, p_satellite_mass_count,
+                p_asteroids, p_comets, p_black_holes, p_fgk_stars)
+        ON CONFLICT (system_name) DO UPDATE SET
+            planet_count = c.planet_count + EXCLUDED.planet_count,
+            planets_with_atmosphere = c.planets_with_atmosphere + EXCLUDED.planets_with_atmosphere,
+            planet_mass_sum = c.planet_mass_sum + EXCLUDED.planet_mass_sum,
+            planet_mass_count = c.planet_mass_count + EXCLUDED.planet_mass_count,
+            satellite_count = c.satellite_count + EXCLUDED.satellite_count,
+            satellite_mass_sum = c.satellite_mass_sum + EXCLUDED.satellite_mass_sum,
+            satellite_mass_count = c.satellite_mass_count + EXCLUDED.satellite_mass_count,
+            asteroid_count = c.asteroid_count + EXCLUDED.asteroid_count,
+            comet_count = c.comet_count + EXCLUDED.comet_count,
+            black_hole_count = c.black_hole_count + EXCLUDED.black_hole_count,
+            fgk_star_count = c.fgk_star_count + EXCLUDED.fgk_star_count;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    planet_function_query = """
+    CREATE OR REPLACE FUNCTION planet_composition_trigger_function()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        sign INT;
+        planet RECORD;
+        satellites INT;
+        satellite_mass_sum DECIMAL;
+        satellite_mass_count INT;
+    BEGIN
+        IF TG_OP = 'UPDATE' AND (NEW.object_id, NEW.origin_system, NEW.planetary_mass, NEW.atmosphere)
+                IS NOT DISTINCT FROM (OLD.object_id, OLD.origin_system, OLD.planetary_mass, OLD.atmosphere) THEN
+            RETURN NULL;
+        END IF;
+        -- Take the old row out and put the new one in; its satellites go with it
+        FOREACH sign IN ARRAY ARRAY[-1, 1] LOOP
+            CONTINUE WHEN (sign = -1 AND TG_OP = 'INSERT') OR (sign = 1 AND TG_OP = 'DELETE');
+            IF sign = -1 THEN
+                planet := OLD;
+            ELSE
+                planet := NEW;
+            END IF;
+            SELECT count(*), COALESCE(sum(satellite_mass), 0), count(satellite_mass)
+            INTO satellites, satellite_mass_sum, satellite_mass_count
+            FROM satellite WHERE parent_planet = planet.object_id;
+            PERFORM system_composition_apply(
+                planet.origin_system,
+                p_planets => sign,
+                p_planets_with_atmosphere => CASE WHEN planet.atmosphere = 'y' THEN sign ELSE 0 END,
+                p_planet_mass_sum => sign * COALESCE(planet.planetary_mass, 0),
+                p_planet_mass_count => CASE WHEN planet.planetary_mass IS NULL THEN 0 ELSE sign END,
+                p_satellites => sign * satellites,
+                p_satellite_mass_sum => sign * satellite_mass_sum,
+                p_satellite_mass_count => sign * satellite_mass_count
+            );
+        END LOOP;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    satellite_function_query = """
+    CREATE OR REPLACE FUNCTION satellite_composition_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND (NEW.object_id, NEW.parent_planet, NEW.satellite_mass)
+                IS NOT DISTINCT FROM (OLD.object_id, OLD.parent_planet, OLD.satellite_mass) THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM system_composition_apply(
+                (SELECT origin_system FROM planet WHERE object_id = OLD.parent_planet),
+                p_satellites => -1,
+                p_satellite_mass_sum => -COALESCE(OLD.satellite_mass, 0),
+                p_satellite_mass_count => CASE WHEN OLD.satellite_mass IS NULL THEN 0 ELSE -1 END
+            );
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM system_composition_apply(
+                (SELECT origin_system FROM planet WHERE object_id = NEW.parent_planet),
+                p_satellites => 1,
+                p_satellite_mass_sum => COALESCE(NEW.satellite_mass, 0),
+                p_satellite_mass_count => CASE WHEN NEW.satellite_mass IS NULL THEN 0 ELSE 1 END
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    misc_function_query = """
+    CREATE OR REPLACE FUNCTION miscellaneous_composition_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND (NEW.origin_system, NEW.misc_category)
+                IS NOT DISTINCT FROM (OLD.origin_system, OLD.misc_category) THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM system_composition_apply(
+                OLD.origin_system,
+                p_asteroids => CASE WHEN OLD.misc_category = 'asteroid' THEN -1 ELSE 0 END,
+                p_comets => CASE WHEN OLD.misc_category = 'comet' THEN -1 ELSE 0 END,
+                p_black_holes => CASE WHEN OLD.misc_category = 'black_hole' THEN -1 ELSE 0 END
+            );
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM system_composition_apply(
+                NEW.origin_system,
+                p_asteroids => CASE WHEN NEW.misc_category = 'asteroid' THEN 1 ELSE 0 END,
+                p_comets => CASE WHEN NEW.misc_category = 'comet' THEN 1 ELSE 0 END,
+                p_black_holes => CASE WHEN NEW.misc_category = 'black_hole' THEN 1 ELSE 0 END
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    star_function_query = """
+    CREATE OR REPLACE FUNCTION star_composition_trigger_function()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND (NEW.origin_system, NEW.stellar_class)
+                IS NOT DISTINCT FROM (OLD.origin_system, OLD.stellar_class) THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP <> 'INSERT' AND OLD.stellar_class IN ('F', 'G', 'K') THEN
+            PERFORM system_composition_apply(OLD.origin_system, p_fgk_stars => -1);
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.stellar_class IN ('F', 'G', 'K') THEN
+            PERFORM system_composition_apply(NEW.origin_system, p_fgk_stars => 1);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+    trigger_queries = [
+        """
+        DROP TRIGGER IF EXISTS planet_composition_trigger ON planet;
+        CREATE TRIGGER planet_composition_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON planet
+        FOR EACH ROW
+        EXECUTE FUNCTION planet_composition_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS satellite_composition_trigger ON satellite;
+        CREATE TRIGGER satellite_composition_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON satellite
+        FOR EACH ROW
+        EXECUTE FUNCTION satellite_composition_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS miscellaneous_composition_trigger ON miscellaneous;
+        CREATE TRIGGER miscellaneous_composition_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON miscellaneous
+        FOR EACH ROW
+        EXECUTE FUNCTION miscellaneous_composition_trigger_function();
+        """,
+        """
+        DROP TRIGGER IF EXISTS star_composition_trigger ON star;
+        CREATE TRIGGER star_composition_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON star
+        FOR EACH ROW
+        EXECUTE FUNCTION star_composition_trigger_function();
+        """,
+    ]
+
+    # One-off load of the rows that existed before the triggers were installed
+    backfill_query = """
+    INSERT INTO system_composition (
+        system_name, planet_count, planets_with_atmosphere, planet_mass_sum, planet_mass_count,
+        satellite_count, satellite_mass_sum, satellite_mass_count,
+        asteroid_count, comet_count, black_hole_count, fgk_star_count
+    )
+    SELECT ss.system_name,
+           p.planets, p.with_atmosphere, p.mass_sum, p.mass_count,
+           sat.satellites, sat.mass_sum, sat.mass_count,
+           m.asteroids, m.comets, m.black_holes,
+           st.fgk_stars
+    FROM star_system ss
+    CROSS JOIN LATERAL (
+        SELECT count(*) AS planets,
+               count(*) FILTER (WHERE atmosphere = 'y') AS with_atmosphere,
+               COALESCE(sum(planetary_mass), 0) AS mass_sum,
+               count(planetary_mass) AS mass_count
+        FROM planet WHERE origin_system = ss.system_name
+    ) p
+    CROSS JOIN LATERAL (
+        SELECT count(*) AS satellites,
+               COALESCE(sum(s.satellite_mass), 0) AS mass_sum,
+               count(s.satellite_mass) AS mass_count
+        FROM satellite s
+        JOIN planet pl ON pl.object_id = s.parent_planet
+        WHERE pl.origin_system = ss.system_name
+    ) sat
+    CROSS JOIN LATERAL (
+        SELECT count(*) FILTER (WHERE misc_category = 'asteroid') AS asteroids,
+               count(*) FILTER (WHERE misc_category = 'comet') AS comets,
+               count(*) FILTER (WHERE misc_category = 'black_hole') AS black_holes
+        FROM miscellaneous WHERE origin_system = ss.system_name
+    ) m
+    CROSS JOIN LATERAL (
+        SELECT count(*) AS fgk_stars
+        FROM star WHERE origin_system = ss.system_name AND stellar_class IN ('F', 'G', 'K')
+    ) st;
+    """
+
+    try:
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        # Create the composition table and its index
+        cur.execute(composition_table_query)
+        cur.execute(composition_index_query)
+        print("The SystemComposition table has been created successfully.")
+
+        # Create the trigger functions
+        for query in (apply_function_query, planet_function_query, satellite_function_query,
+                      misc_function_query, star_function_query):
+            cur.execute(query)
+        print("The trigger functions for the SystemComposition table have been created successfully.")
+
+        # Create the triggers
+        for query in trigger_queries:
+            cur.execute(query)
+        print("The triggers for the SystemComposition table have been created successfully.")
+
+        cur.execute(backfill_query)
+        print("The SystemComposition table has been populated successfully.")
+
+        conn.commit()
+    except Exception as e:
+        print(f"An error occurred in the SystemComposition table setup: {e}")
+        conn.rollback()
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
@@ -0,0 +1,56 @@
+from Backend.DB.ConnectionPool import get_pool
+
+
+# One pooled connection and one transaction per request. Leaving the `with`
+# block commits; an exception rolls back. Code that decides to abandon its
+# changes without raising (e.g. returning an error dict) calls rollback().
+# Callbacks registered with after_commit() run once the commit has succeeded.
+#
+#     with UnitOfWork() as uow:
+#         cursor = uow.cursor()
+#         cursor.execute(...)
+class UnitOfWork:
+
+    def __init__(self, pool=None):
+        self._pool = pool
+        self.conn = None
+        self._finished = False
+        self._after_commit = []
+
+    def __enter__(self):
+        if self._pool is None:
+            self._pool = get_pool()
+        self.conn = self._pool.getconn()
+        self._finished = False
+        self._after_commit = []
+        return self
+
+    def cursor(self):
+        return self.conn.cursor()
+
+    def after_commit(self, callback):
+        self._after_commit.append(callback)
+
+    def commit(self):
+        self._finished = True
+        self.conn.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self._finished = True
+        self._after_commit = []
+        self.conn.rollback()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if not self._finished:
+                if exc_type is None:
+                    self.commit()
+                else:
+                    self.rollback()
+        finally:
+            self._pool.putconn(self.conn, discard=bool(self.conn.closed))
+            self.conn = None
+        return False
@@ -15,6 +15,12 @@ from Backend.DB.SCHEMA.Sattelite import Sattelite
 from Backend.DB.SCHEMA.Star import Star
 from Backend.DB.SCHEMA.StarSystem import StarSystem
 from Backend.DB.SCHEMA.Telescope import Telescope
+from Backend.DB.SCHEMA.SearchIndexes import SearchIndexes
+from Backend.DB.SCHEMA.Catalogue import Catalogue
+from Backend.DB.SCHEMA.CatalogueNotify import CatalogueNotify
+from Backend.DB.SCHEMA.StellarRollups import StellarRollups
+from Backend.DB.SCHEMA.SystemComposition import SystemComposition
+from Backend.DB.SCHEMA.DiscoveryCube import DiscoveryCube
 
 
 
@@ -93,6 +99,30 @@ if __name__ == "__main__":
     else :
         Discovery()        
 
+    if(check_table_exists("catalogue_entry")):
+        print(f"The table catalogue_entry already exists.")
+    else :
+        Catalogue()
+
+    if(check_table_exists("stellar_class_rollup")):
+        print(f"The table stellar_class_rollup already exists.")
+    else :
+        StellarRollups()
+
+    if(check_table_exists("system_composition")):
+        print(f"The table system_composition already exists.")
+    else :
+        SystemComposition()
+
+    if(check_table_exists("discovery_cube")):
+        print(f"The table discovery_cube already exists.")
+    else :
+        DiscoveryCube()
+
+    # Indexes and triggers below are created idempotently, so these are safe to re-run
+    SearchIndexes()
+    CatalogueNotify()
+
 
 
 
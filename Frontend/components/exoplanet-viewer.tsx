@@ -43,28 +43,23 @@ export default function ExoplanetViewer() {
     }
 
     setIsLoading(true)
-    let uploadEndpoint: string, viewEndpoint: string
+    let uploadEndpoint: string
 
     switch (type) {
       case "telescope":
         uploadEndpoint = "/upload-image/"
-        viewEndpoint = "/view-image"
         break
       case "coordinate":
         uploadEndpoint = "/upload-image-Coordinate_plot"
-        viewEndpoint = "/view-image-Coordinate"
         break
       case "planetsys":
         uploadEndpoint = "/upload-image-Planetsys"
-        viewEndpoint = "/show-image-Planetsys"
         break
       case "stellardist":
         uploadEndpoint = "/upload-image-stellerDist"
-        viewEndpoint = "/show-image-stellerDist"
         break
       case "3dmap":
         uploadEndpoint = "/MAP/"
-        viewEndpoint = "/viewmap"
         break
       default:
         console.error("Invalid image type")
@@ -73,52 +68,35 @@ export default function ExoplanetViewer() {
     }
 
     try {
+      let response: Response
       // Handle 3D map case separately
       if (type === "3dmap" && selectedSystem) {
         console.log(`Fetching 3D map for system: ${selectedSystem}`)
-        const response = await fetch(`${API_BASE_URL}${uploadEndpoint}?ss=${selectedSystem}`, {
-          method: "POST",
-        })
-
-        if (!response.ok) {
-          console.error(`Failed to generate 3D map. Status: ${response.status}`)
-          const errorText = await response.text()
-          console.error(`Error details: ${errorText}`)
-          setIsLoading(false)
-          return
-        }
+        response = await fetch(`${API_BASE_URL}${uploadEndpoint}?ss=${selectedSystem}&inline=true`)
       }
       // Handle coordinate case
       else if (type === "coordinate" && selectedSystem) {
         console.log(`Fetching coordinate plot for system: ${selectedSystem}`)
-        const response = await fetch(`${API_BASE_URL}${uploadEndpoint}?star_system=${selectedSystem}`, {
-          method: "POST",
-        })
-
-        if (!response.ok) {
-          console.error(`Failed to generate coordinate plot. Status: ${response.status}`)
-          const errorText = await response.text()
-          console.error(`Error details: ${errorText}`)
-          setIsLoading(false)
-          return
-        }
+        response = await fetch(`${API_BASE_URL}${uploadEndpoint}?star_system=${selectedSystem}&inline=true`)
       }
       // Handle other cases
       else if (type !== "coordinate" && type !== "3dmap") {
-        const response = await fetch(`${API_BASE_URL}${uploadEndpoint}`, { method: "POST" })
-        if (!response.ok) {
-          console.error(`Failed to generate ${type} plot. Status: ${response.status}`)
-          setIsLoading(false)
-          return
-        }
+        response = await fetch(`${API_BASE_URL}${uploadEndpoint}?inline=true`)
+      } else {
+        return
       }
 
-      // Now fetch the image
-      console.log(`Fetching image from: ${API_BASE_URL}${viewEndpoint}`)
-      const imageResponse = await fetch(`${API_BASE_URL}${viewEndpoint}`)
+      if (!response.ok) {
+        console.error(`Failed to generate ${type} plot. Status: ${response.status}`)
+        const errorText = await response.text()
+        console.error(`Error details: ${errorText}`)
+        return
+      }
 
-      if (imageResponse.ok) {
-        const blob = await imageResponse.blob()
+      // inline=true returns the rendered PNG itself; error cases still come back as JSON.
+      // GET lets the browser revalidate its copy with If-None-Match and reuse it on a 304.
+      if (response.headers.get("content-type")?.startsWith("image/")) {
+        const blob = await response.blob()
         const imageUrl = URL.createObjectURL(blob)
         setImageUrl(imageUrl)
         setImageType(type)
@@ -126,9 +104,8 @@ export default function ExoplanetViewer() {
           setShowDropdown(false)
         }
       } else {
-        console.error(`Failed to fetch image. Status: ${imageResponse.status}`)
-        const errorText = await imageResponse.text()
-        console.error(`Error details: ${errorText}`)
+        const data = await response.json()
+        console.error(`No image generated: ${data.message ?? data.error}`)
       }
     } catch (error) {
       console.error("Error:", error)
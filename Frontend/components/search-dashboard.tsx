@@ -85,8 +85,9 @@ export default function AstronomyDBViewer() {
         return
       }
 
+      // Search endpoints return one page: { items, next_cursor }
       const data = await response.json()
-      setResults(data)
+      setResults(data.items)
     } catch (error) {
       console.error("Error fetching data:", error)
     }